@@ -1,7 +1,11 @@
 """LLM integration using Ollama for intelligent workflow understanding."""
 
+import functools
+import hashlib
 import json
-from typing import Dict, List, Optional
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 try:
     import ollama
@@ -10,10 +14,23 @@ except ImportError as exc:
         "Missing dependency 'ollama'. Install it with `pip install ollama`."
     ) from exc
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj: object) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 
 # Default model - can be overridden
 DEFAULT_MODEL = "llama3.2:latest"
 
+# Workflow descriptions already generated, keyed by a hash of the events
+DESC_CACHE_PATH = Path.home() / ".navi" / "desc_cache.json"
+
 
 def set_default_model(model: str) -> None:
     """Set the default Ollama model to use."""
@@ -55,16 +72,15 @@ def find_best_workflow_llm(
     model = model or DEFAULT_MODEL
     
     # Build context about available workflows
-    workflow_summaries = []
-    for idx, workflow in enumerate(workflows):
-        name = workflow.get("name", "Unnamed")
-        description = workflow.get("description", "")
-        event_count = len(workflow.get("events", []))
-        workflow_summaries.append(
-            f"Workflow {idx}: '{name}' - {description} ({event_count} events)"
+    workflows_text = _build_summaries(tuple(
+        (
+            workflow.get("id"),
+            workflow.get("name", "Unnamed"),
+            workflow.get("description", ""),
+            len(workflow.get("events", [])),
         )
-    
-    workflows_text = "\n".join(workflow_summaries)
+        for workflow in workflows
+    ))
     
     prompt = f"""You are a workflow automation assistant. Given a user's command and a list of available workflows, determine which workflow best matches the user's intent.
 
@@ -108,7 +124,7 @@ If no workflow matches well (confidence < 0.3), set workflow_index to -1.
         elif "```" in content:
             content = content.split("```")[1].split("```")[0].strip()
         
-        result = json.loads(content)
+        result = _loads(content)
         workflow_idx = result.get("workflow_index", -1)
         confidence = result.get("confidence", 0.0)
         
@@ -126,6 +142,17 @@ If no workflow matches well (confidence < 0.3), set workflow_index to -1.
         return None
 
 
+@functools.lru_cache(maxsize=8)
+def _build_summaries(workflow_keys: Tuple[Tuple[object, str, str, int], ...]) -> str:
+    """Format the workflow list for the matching prompt (cached per workflow set)."""
+    workflow_summaries = []
+    for idx, (_, name, description, event_count) in enumerate(workflow_keys):
+        workflow_summaries.append(
+            f"Workflow {idx}: '{name}' - {description} ({event_count} events)"
+        )
+    return "\n".join(workflow_summaries)
+
+
 def analyze_workflow_events(events: List[Dict], model: Optional[str] = None) -> str:
     """
     Analyze recorded events with rich context and generate an intelligent description.
@@ -139,14 +166,19 @@ def analyze_workflow_events(events: List[Dict], model: Optional[str] = None) ->
         return "Empty workflow with no events."
     
     model = model or DEFAULT_MODEL
+
+    cache = _load_desc_cache()
+    cache_key = _events_cache_key(events, model)
+    if cache_key in cache:
+        return cache[cache_key]
     
     # Extract rich context from events
     event_summary = []
     click_count = 0
     key_count = 0
     window_changes = []
-    applications_used = set()
-    ocr_texts = []
+    applications_used: Counter = Counter()
+    ocr_texts: Counter = Counter()
     key_actions = []
     
     # Analyze events with context
@@ -159,7 +191,7 @@ def analyze_workflow_events(events: List[Dict], model: Optional[str] = None) ->
             app = window.get("app", "")
             title = window.get("title", "")
             if app:
-                applications_used.add(app)
+                applications_used[app] += 1
             if title and event_type in ["window_change", "recording_start"]:
                 window_changes.append(f"{app}: {title}")
         
@@ -176,7 +208,7 @@ def analyze_workflow_events(events: List[Dict], model: Optional[str] = None) ->
                 action_desc = f"Click {button} button{window_info}"
                 if ocr:
                     action_desc += f" (visible text: '{ocr[:50]}...')"
-                    ocr_texts.append(ocr)
+                    ocr_texts[ocr[:60]] += 1
                 
                 event_summary.append(action_desc)
         
@@ -208,19 +240,21 @@ def analyze_workflow_events(events: List[Dict], model: Optional[str] = None) ->
     ]
     
     if applications_used:
-        summary_parts.append(f"- Applications used: {', '.join(applications_used)}")
+        top_apps = [app for app, _ in applications_used.most_common(5)]
+        summary_parts.append(f"- Applications used: {', '.join(top_apps)}")
     
     if window_changes:
         summary_parts.append(f"- Window changes: {len(window_changes)}")
         summary_parts.append(f"  Windows: {'; '.join(window_changes[:5])}")
     
     if ocr_texts:
-        summary_parts.append(f"- Captured text from screen: {len(ocr_texts)} instances")
-        # Show sample OCR text
-        unique_texts = list(set(ocr_texts))[:5]
-        for text in unique_texts:
+        summary_parts.append(
+            f"- Captured text from screen: {sum(ocr_texts.values())} instances"
+        )
+        # Show the most frequent OCR text
+        for text, _ in ocr_texts.most_common(5):
             if text:
-                summary_parts.append(f"  Text: '{text[:60]}...'")
+                summary_parts.append(f"  Text: '{text}...'")
     
     summary_parts.append("\nKey actions performed:")
     summary_parts.extend(event_summary[:30])  # Show more actions with context
@@ -259,13 +293,44 @@ Description:"""
             ],
         )
         
-        return response["message"]["content"].strip()
+        description = response["message"]["content"].strip()
+        cache[cache_key] = description
+        _save_desc_cache(cache)
+        return description
         
     except Exception as e:
         print(f"Workflow analysis error: {e}")
         return "Workflow automation sequence"
 
 
+def _events_cache_key(events: List[Dict], model: str) -> str:
+    """Hash the parts of the events that determine their description."""
+    payload = _dumps([
+        model,
+        [
+            (e.get("type"), e.get("t"), e.get("x"), e.get("y"), e.get("key"))
+            for e in events
+        ],
+    ])
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _load_desc_cache() -> Dict[str, str]:
+    try:
+        return _loads(DESC_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_desc_cache(cache: Dict[str, str]) -> None:
+    try:
+        DESC_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        DESC_CACHE_PATH.write_bytes(_dumps(cache))
+    except OSError:
+        # The cache is only an optimization
+        pass
+
+
 def generate_workflow_name(description: str, model: Optional[str] = None) -> str:
     """
     Generate a concise workflow name based on description.
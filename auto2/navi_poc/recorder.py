@@ -1,3 +1,4 @@
+import queue
 import threading
 import time
 from typing import Dict, List, Optional
@@ -14,29 +15,54 @@ from screen_understanding import get_active_window, get_screen_context
 
 Event = Dict[str, object]
 
+# Special keys recorded as "Key.<name>", precomputed instead of str(key)
+_KEY_NAMES: Dict[keyboard.Key, str] = {key: f"Key.{key.name}" for key in keyboard.Key}
+
+# Mouse moves reuse the cached active window unless it is older than this.
+WINDOW_POLL_INTERVAL_NS = 250_000_000
+
+# Pending screen context captures; further requests are dropped when full.
+CONTEXT_QUEUE_SIZE = 8
+
 
 class Recorder:
     """Capture mouse and keyboard activity until stopped."""
 
     def __init__(self, capture_context: bool = True) -> None:
         self.events: List[Event] = []
-        self.start_time: Optional[float] = None
+        # perf_counter_ns() at start; events carry integer "t_ns" until stop()
+        self._start_ns: Optional[int] = None
         self._mouse_listener: Optional[mouse.Listener] = None
         self._keyboard_listener: Optional[keyboard.Listener] = None
         self._lock = threading.Lock()
         self._should_stop = False
         self.capture_context = capture_context
-        self._last_window: Optional[Dict] = None
+        self._last_window_key: Optional[tuple] = None
+        self._cached_window: Optional[Dict] = None
+        self._last_window_poll_ns = 0
+        # Screen context (OCR) is captured off the listener threads
+        self._ctx_q: "queue.Queue[Optional[tuple]]" = queue.Queue(
+            maxsize=CONTEXT_QUEUE_SIZE
+        )
+        self._ctx_thread: Optional[threading.Thread] = None
 
     # --------------------------------------------------------------------- API
     def start(self) -> None:
         """Start recording events."""
-        if self.start_time is not None:
+        if self._start_ns is not None:
             raise RuntimeError("Recorder already running.")
 
         self.events = []
-        self.start_time = time.time()
+        self._start_ns = time.perf_counter_ns()
         self._should_stop = False
+        self._last_window_key = None
+        self._cached_window = None
+        self._last_window_poll_ns = 0
+
+        if self.capture_context:
+            self._ctx_q = queue.Queue(maxsize=CONTEXT_QUEUE_SIZE)
+            self._ctx_thread = threading.Thread(target=self._ctx_worker, daemon=True)
+            self._ctx_thread.start()
 
         self._mouse_listener = mouse.Listener(
             on_move=self._on_move,
@@ -59,7 +85,7 @@ class Recorder:
 
     def stop(self) -> List[Event]:
         """Stop recording and return the captured events."""
-        if self.start_time is None:
+        if self._start_ns is None:
             raise RuntimeError("Recorder not running.")
 
         for listener in (self._mouse_listener, self._keyboard_listener):
@@ -70,37 +96,99 @@ class Recorder:
         self._mouse_listener = None
         self._keyboard_listener = None
 
+        if self._ctx_thread is not None:
+            # Let queued captures finish, then stop the worker. Both waits are
+            # untimed: a worker still running would keep writing into events
+            # after they are returned
+            self._ctx_q.put(None)
+            self._ctx_thread.join()
+            self._ctx_thread = None
+
         events = list(self.events)
+        for event in events:
+            event["t"] = event.pop("t_ns") / 1e9
         self.events = []
-        self.start_time = None
+        self._start_ns = None
         self._should_stop = False
         return events
 
     # ----------------------------------------------------------------- Helpers
-    def _elapsed(self) -> float:
-        assert self.start_time is not None
-        return time.time() - self.start_time
+    def _elapsed_ns(self) -> int:
+        assert self._start_ns is not None
+        return time.perf_counter_ns() - self._start_ns
 
     def _record(self, event: Event) -> None:
         with self._lock:
-            event["t"] = round(float(event.get("t", self._elapsed())), 6)
+            event["t_ns"] = self._elapsed_ns()
             
             # Capture window context
             if self.capture_context:
-                current_window = get_active_window()
-                if current_window != self._last_window:
+                current_window = self._poll_window(event)
+                # Compare a small identity tuple rather than the whole dict
+                window_key = (
+                    (
+                        current_window.get("app"),
+                        current_window.get("title"),
+                        current_window.get("hwnd"),
+                    )
+                    if current_window
+                    else None
+                )
+                if window_key != self._last_window_key:
                     # Record window change
                     self.events.append({
                         "type": "window_change",
-                        "t": event["t"],
+                        "t_ns": event["t_ns"],
                         "window": current_window
                     })
-                    self._last_window = current_window
+                    self._last_window_key = window_key
                 
                 event["window"] = current_window
             
             self.events.append(event)
 
+    def _poll_window(self, event: Event) -> Optional[Dict]:
+        """Return the active window, throttling lookups for mouse moves."""
+        t_ns = event["t_ns"]
+        if (
+            event.get("type") != "mouse_move"
+            or self._cached_window is None
+            or t_ns - self._last_window_poll_ns > WINDOW_POLL_INTERVAL_NS
+        ):
+            self._cached_window = get_active_window()
+            self._last_window_poll_ns = t_ns
+        return self._cached_window
+
+    def _queue_context(self, event: Event, x: Optional[int], y: Optional[int]) -> None:
+        """Ask the worker to attach screen context to an already recorded event."""
+        try:
+            self._ctx_q.put_nowait((event, x, y))
+        except queue.Full:
+            # Drop rather than block the input listener
+            pass
+
+    def _ctx_worker(self) -> None:
+        """Capture screen context for queued events until stopped."""
+        pointer = mouse.Controller()
+        while True:
+            item = self._ctx_q.get()
+            if item is None:
+                return
+            event, x, y = item
+
+            try:
+                if x is None or y is None:
+                    # Key presses: capture near the mouse, where typing happens
+                    x, y = pointer.position
+                context = get_screen_context(int(x), int(y))
+            except Exception:
+                continue
+
+            # Keep the window recorded with the event itself
+            context.pop("window", None)
+            with self._lock:
+                event.update(context)
+
     # --------------------------------------------------------------- Listeners
     def _on_move(self, x: int, y: int) -> None:
         try:
@@ -122,12 +210,11 @@ class Recorder:
                 "pressed": pressed,
             }
             
+            self._record(event)
+
             # Capture screen context when button is released (more accurate)
             if self.capture_context and not pressed:
-                context = get_screen_context(x, y)
-                event.update(context)
-            
-            self._record(event)
+                self._queue_context(event, x, y)
         except Exception:
             # Don't let exceptions stop the listener
             pass
@@ -165,19 +252,11 @@ class Recorder:
                 "key": self._normalize_key(key),
             }
             
+            self._record(event)
+
             # Capture context for text input
             if self.capture_context:
-                # Get mouse position to capture context near where typing happens
-                try:
-                    from pynput.mouse import Controller
-                    mouse_controller = Controller()
-                    mouse_pos = mouse_controller.position
-                    context = get_screen_context(mouse_pos[0], mouse_pos[1])
-                    event.update(context)
-                except Exception:
-                    pass
-            
-            self._record(event)
+                self._queue_context(event, None, None)
         except Exception:
             # Don't let exceptions stop the listener
             pass
@@ -196,8 +275,9 @@ class Recorder:
 
     @staticmethod
     def _normalize_key(key: keyboard.KeyCode | keyboard.Key) -> str:
-        try:
-            return key.char  # type: ignore[return-value]
-        except AttributeError:
-            return str(key)
+        if isinstance(key, keyboard.Key):
+            return _KEY_NAMES.get(key) or str(key)
+        # vk-only KeyCodes (numpad, media keys) have no char
+        ch = key.char
+        return ch if ch is not None else _KEY_NAMES.get(key, str(key))
 
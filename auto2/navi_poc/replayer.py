@@ -1,5 +1,6 @@
 import time
-from typing import Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 try:
     import pyautogui
@@ -8,6 +9,12 @@ except ImportError as exc:  # pragma: no cover - handled at runtime
         "Missing dependency 'pyautogui'. Install it with `pip install pyautogui`."
     ) from exc
 
+try:
+    from pynput.mouse import Controller as MouseController
+    _mouse_ctrl = MouseController()
+except Exception:  # pragma: no cover - falls back to pyautogui
+    _mouse_ctrl = None
+
 from screen_understanding import (
     find_text_on_screen,
     find_element_by_semantic_description,
@@ -20,6 +27,15 @@ pyautogui.PAUSE = 0
 
 Event = Dict[str, object]
 
+# Consecutive mouse moves closer together than this replay as one move.
+MOVE_COALESCE_WINDOW = 0.016
+
+# Character key events closer together than this replay as one typed string.
+TYPE_COALESCE_GAP = 0.05
+
+# Shorter waits than this are skipped rather than slept
+MIN_SLEEP_NS = 1_000_000
+
 
 KEY_ALIASES = {
     "Key.space": "space",
@@ -33,6 +49,21 @@ KEY_ALIASES = {
     "Key.alt_r": "altright",
 }
 
+# Other recorded special keys ("Key.<name>") replay as their bare name
+try:
+    from pynput.keyboard import Key as _PynputKey
+    for _key in _PynputKey:
+        KEY_ALIASES.setdefault(f"Key.{_key.name}", _key.name)
+except ImportError:  # pragma: no cover - resolved per key instead
+    pass
+
+# Common words that don't identify a UI element
+_FILTER_WORDS: frozenset = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+    "of", "with", "by", "from", "is", "are", "was", "were", "be", "been",
+    "click", "button", "field", "input", "text", "menu", "option"
+})
+
 
 def replay(events: Iterable[Event], intelligent: bool = True) -> None:
     """
@@ -41,55 +72,177 @@ def replay(events: Iterable[Event], intelligent: bool = True) -> None:
     If intelligent=True, uses semantic understanding to find elements
     instead of fixed coordinates.
     """
-    events_list: List[Event] = list(events)
+    events_list: List[Event] = _coalesce_moves(events)
     if not events_list:
         print("No events to replay.")
         return
+    _prepare_events(events_list)
 
     analyzer = ActionAnalyzer(use_llm=intelligent) if intelligent else None
     
-    # Analyze events first to understand the workflow
+    # Analyze the workflow in the background; replay doesn't wait for it
+    executor: Optional[ThreadPoolExecutor] = None
     if intelligent and analyzer:
-        try:
-            print("Analyzing workflow...")
-            understanding = analyzer.understand_workflow(events_list)
-            print(f"Workflow: {understanding.get('summary', 'Unknown workflow')}")
-            apps = understanding.get('applications_used', [])
-            if apps:
-                print(f"Applications: {', '.join(apps)}")
-            print()
-        except Exception as e:
-            print(f"Warning: Workflow analysis failed: {e}")
-            print("Continuing with basic replay...\n")
+        print("Analyzing workflow...")
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(analyzer.understand_workflow, events_list).add_done_callback(
+            _print_understanding
+        )
 
+    # Sleep until each event's offset from the start so delays don't drift
+    start_ns = time.perf_counter_ns()
     previous_time = 0.0
-    for event in events_list:
+    for event in _coalesce_typing(events_list):
         event_time = float(event.get("t", previous_time))
-        delay = max(0.0, event_time - previous_time)
-        if delay:
-            time.sleep(delay)
         previous_time = event_time
+        remaining_ns = start_ns + int(event_time * 1e9) - time.perf_counter_ns()
+        if remaining_ns > MIN_SLEEP_NS:
+            time.sleep(remaining_ns / 1e9)
 
         event_type = event.get("type")
-        if event_type == "mouse_move":
-            _move_mouse(event, intelligent)
-        elif event_type == "mouse_click":
-            _handle_click(event, intelligent, analyzer if intelligent else None)
-        elif event_type == "mouse_scroll":
-            _handle_scroll(event)
-        elif event_type == "key_press":
-            _handle_key(event, press=True)
-        elif event_type == "key_release":
-            _handle_key(event, press=False)
-        elif event_type == "window_change":
-            # Note window changes but don't try to switch windows
-            window = event.get("window", {})
-            print(f"[Window: {window.get('app', 'unknown')} - {window.get('title', 'unknown')}]")
+        handler = _HANDLERS.get(event_type)
+        if handler:
+            handler(event, intelligent, analyzer)
         else:
             print(f"Skipping unknown event: {event_type}")
 
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def _print_understanding(future: Future) -> None:
+    """Report the background workflow analysis once it finishes."""
+    try:
+        understanding = future.result()
+    except Exception as e:
+        print(f"Warning: Workflow analysis failed: {e}")
+        return
+
+    print(f"Workflow: {understanding.get('summary', 'Unknown workflow')}")
+    apps = understanding.get('applications_used', [])
+    if apps:
+        print(f"Applications: {', '.join(apps)}")
+
+
+def _prepare_events(events: Iterable[Event]) -> None:
+    """Resolve pyautogui key and button names once, caching them on the events."""
+    for event in events:
+        event_type = event.get("type")
+        if event_type in ("key_press", "key_release"):
+            if "_key" not in event:
+                event["_key"] = _resolve_key(event.get("key", ""))
+        elif event_type == "mouse_click":
+            if "_button" not in event:
+                event["_button"] = _resolve_button(event.get("button"))
+
+
+def _resolve_key(key: object) -> str:
+    key = str(key)
+    alias = KEY_ALIASES.get(key)
+    if alias is not None:
+        return alias
+    return key if len(key) == 1 else key.removeprefix("Key.")
+
+
+def _resolve_button(button: object) -> str:
+    return str(button or "left").replace("Button.", "")
+
+
+def _coalesce_moves(events: Iterable[Event]) -> List[Event]:
+    """Keep only the last of each run of closely spaced mouse moves."""
+    merged: List[Event] = []
+    run_start: Optional[float] = None
+    for event in events:
+        if event.get("type") != "mouse_move":
+            merged.append(event)
+            run_start = None
+            continue
+
+        event_time = float(event.get("t", 0.0))
+        if run_start is not None and event_time - run_start < MOVE_COALESCE_WINDOW:
+            merged[-1] = event
+        else:
+            merged.append(event)
+            run_start = event_time
+    return merged
+
 
-def _move_mouse(event: Event, intelligent: bool = False) -> None:
+def _typed_char(event: Event) -> Optional[str]:
+    """Return the character a key event types, or None for other keys."""
+    key = str(event.get("key", ""))
+    if key == "Key.space":
+        return " "
+    if len(key) == 1 and key.isprintable():
+        return key
+    return None
+
+
+def _coalesce_typing(events: List[Event]) -> List[Event]:
+    """Merge runs of quickly typed characters into single "typewrite" events.
+
+    A run starts at a character key press with no other key held down and
+    continues while character presses/releases follow within
+    TYPE_COALESCE_GAP; it ends at the last point where every key in it has
+    been released.
+    """
+    merged: List[Event] = []
+    held: set = set()  # non-character keys currently down
+    i = 0
+    while i < len(events):
+        event = events[i]
+        event_type = event.get("type")
+
+        if event_type == "key_press" and not held and _typed_char(event) is not None:
+            down: set = set()
+            chars: List[str] = []
+            end = None  # index just past the last complete run
+            end_chars = 0
+            previous_t = float(event.get("t", 0.0))
+            j = i
+            while j < len(events):
+                candidate = events[j]
+                candidate_type = candidate.get("type")
+                char = _typed_char(candidate)
+                t = float(candidate.get("t", previous_t))
+                if (
+                    candidate_type not in ("key_press", "key_release")
+                    or char is None
+                    or t - previous_t >= TYPE_COALESCE_GAP
+                ):
+                    break
+                key = candidate.get("key")
+                if candidate_type == "key_press":
+                    down.add(key)
+                    chars.append(char)
+                elif key in down:
+                    down.discard(key)
+                else:
+                    break
+                previous_t = t
+                j += 1
+                if not down:
+                    end, end_chars = j, len(chars)
+
+            if end is not None and end_chars > 1:
+                merged.append({
+                    "type": "typewrite",
+                    "text": "".join(chars[:end_chars]),
+                    "t": event.get("t", 0.0),
+                })
+                i = end
+                continue
+
+        if event_type in ("key_press", "key_release") and _typed_char(event) is None:
+            if event_type == "key_press":
+                held.add(event.get("key"))
+            else:
+                held.discard(event.get("key"))
+        merged.append(event)
+        i += 1
+    return merged
+
+
+def _move_mouse(event: Event, intelligent: bool = False, analyzer: Optional[ActionAnalyzer] = None) -> None:
     """Move mouse, using intelligent positioning if available."""
     x = event.get("x")
     y = event.get("y")
@@ -103,14 +256,17 @@ def _move_mouse(event: Event, intelligent: bool = False) -> None:
                 x, y = location
     
     if x is not None and y is not None:
-        pyautogui.moveTo(x, y, duration=0.1)  # Slight duration for natural movement
+        if _mouse_ctrl is not None:
+            _mouse_ctrl.position = (int(x), int(y))
+        else:
+            pyautogui.moveTo(x, y)
 
 
 def _handle_click(event: Event, intelligent: bool = False, analyzer: Optional[ActionAnalyzer] = None) -> None:
     """Handle mouse click, using intelligent element finding if available."""
     x = event.get("x")
     y = event.get("y")
-    button = (event.get("button") or "left").replace("Button.", "")
+    button = event.get("_button") or _resolve_button(event.get("button"))
     pressed = bool(event.get("pressed", True))
     
     # Intelligent element finding
@@ -162,15 +318,9 @@ def _extract_meaningful_text(text: str) -> Optional[str]:
     if not text:
         return None
     
-    # Common words to filter out
-    filter_words = {
-        "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
-        "of", "with", "by", "from", "is", "are", "was", "were", "be", "been",
-        "click", "button", "field", "input", "text", "menu", "option"
-    }
-    
-    words = text.lower().split()
-    meaningful = [w for w in words if w not in filter_words and len(w) > 2]
+    meaningful = [
+        w for w in text.lower().split() if len(w) > 2 and w not in _FILTER_WORDS
+    ]
     
     # Return the longest meaningful word or phrase
     if meaningful:
@@ -182,7 +332,7 @@ def _extract_meaningful_text(text: str) -> Optional[str]:
     return text[:20] if text else None
 
 
-def _handle_scroll(event: Event) -> None:
+def _handle_scroll(event: Event, intelligent: bool = False, analyzer: Optional[ActionAnalyzer] = None) -> None:
     dx = int(event.get("dx", 0))
     dy = int(event.get("dy", 0))
     pyautogui.scroll(dy)
@@ -190,19 +340,34 @@ def _handle_scroll(event: Event) -> None:
         pyautogui.hscroll(dx)
 
 
-def _handle_key(event: Event, press: bool) -> None:
-    key = str(event.get("key", ""))
-    key = KEY_ALIASES.get(key, key)
+def _handle_key_press(event: Event, intelligent: bool = False, analyzer: Optional[ActionAnalyzer] = None) -> None:
+    pyautogui.keyDown(event.get("_key") or _resolve_key(event.get("key", "")))
+
+
+def _handle_key_release(event: Event, intelligent: bool = False, analyzer: Optional[ActionAnalyzer] = None) -> None:
+    pyautogui.keyUp(event.get("_key") or _resolve_key(event.get("key", "")))
 
-    if len(key) == 1:
-        if press:
-            pyautogui.keyDown(key)
-        else:
-            pyautogui.keyUp(key)
-    else:
-        normalized = key.replace("Key.", "")
-        if press:
-            pyautogui.keyDown(normalized)
-        else:
-            pyautogui.keyUp(normalized)
 
+def _handle_typewrite(event: Event, intelligent: bool = False, analyzer: Optional[ActionAnalyzer] = None) -> None:
+    pyautogui.write(str(event.get("text", "")), interval=0)
+
+
+def _handle_window_change(event: Event, intelligent: bool = False, analyzer: Optional[ActionAnalyzer] = None) -> None:
+    # Note window changes but don't try to switch windows
+    window = event.get("window", {})
+    print(f"[Window: {window.get('app', 'unknown')} - {window.get('title', 'unknown')}]")
+
+
+# Event type -> handler(event, intelligent, analyzer); all handlers share that
+# signature so each event costs a single call
+Handler = Callable[[Event, bool, Optional[ActionAnalyzer]], None]
+
+_HANDLERS: Dict[str, Handler] = {
+    "mouse_move": _move_mouse,
+    "mouse_click": _handle_click,
+    "mouse_scroll": _handle_scroll,
+    "key_press": _handle_key_press,
+    "key_release": _handle_key_release,
+    "typewrite": _handle_typewrite,
+    "window_change": _handle_window_change,
+}
@@ -1,7 +1,12 @@
 """Screen understanding capabilities: OCR, window detection, and element identification."""
 
+import ctypes
+import hashlib
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from contextlib import closing
+from typing import Dict, Iterator, List, Optional, Tuple
 
 try:
     import pyautogui
@@ -11,12 +16,21 @@ except ImportError as exc:
         "Missing dependencies. Install with: pip install pyautogui pillow"
     ) from exc
 
+try:
+    from tesserocr import PSM, RIL, PyTessBaseAPI, iterate_level
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
 try:
     import pytesseract
-    TESSERACT_AVAILABLE = True
+    PYTESSERACT_AVAILABLE = True
 except ImportError:
-    TESSERACT_AVAILABLE = False
-    # Don't print warning here - it will be printed when needed
+    PYTESSERACT_AVAILABLE = False
+
+# Prefer tesserocr (in-process); pytesseract runs the tesseract binary per call
+TESSERACT_AVAILABLE = TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE
+# Don't print warning here - it will be printed when needed
 
 try:
     import win32gui
@@ -32,6 +46,129 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+try:
+    from rapidfuzz import fuzz, utils
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    import uiautomation
+    UIA_AVAILABLE = True
+except ImportError:
+    UIA_AVAILABLE = False
+
+
+# OCR results for captured regions, keyed by a hash of the pixels
+_OCR_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_OCR_CACHE_MAX = 512
+_ocr_cache_lock = threading.Lock()
+
+# Limits for walking the foreground window's UI Automation tree
+UIA_MAX_DEPTH = 12
+UIA_MAX_CONTROLS = 2000
+
+# UI text has a ~10 px cap height at 100% display scaling; Tesseract reads
+# reliably down to ~20 px, so full-screen OCR is only shrunk when the display
+# scale leaves text at least that tall afterwards
+UI_CAP_HEIGHT_PX = 10
+OCR_MIN_CAP_HEIGHT_PX = 20
+
+# Minimum fuzzy score (0-100) for an OCR word to match the searched text
+TEXT_MATCH_CUTOFF = 85.0
+
+# Full screenshots are reused for this long, so nearby events share one grab
+_SCREEN_TTL_S = 0.1
+_SCREEN_CACHE: Tuple[float, Optional[Image.Image]] = (0.0, None)
+_screen_cache_lock = threading.Lock()
+
+
+def _get_cached_screenshot() -> Image.Image:
+    """Return a full screenshot, reusing one taken within the last _SCREEN_TTL_S."""
+    global _SCREEN_CACHE
+    with _screen_cache_lock:
+        taken, screenshot = _SCREEN_CACHE
+        now = time.monotonic()
+        if screenshot is None or now - taken >= _SCREEN_TTL_S:
+            screenshot = pyautogui.screenshot()
+            _SCREEN_CACHE = (now, screenshot)
+        return screenshot
+
+
+# Single tesserocr instance, created on first use and shared by all threads
+_ocr_api = None
+_ocr_lock = threading.Lock()
+
+
+def _get_ocr_api():
+    global _ocr_api
+    if _ocr_api is None:
+        _ocr_api = PyTessBaseAPI()
+    return _ocr_api
+
+
+def _ocr_text(image: Image.Image, single_line: bool = False) -> str:
+    """Run OCR on an image and return the recognized text."""
+    if TESSEROCR_AVAILABLE:
+        with _ocr_lock:
+            api = _get_ocr_api()
+            api.SetPageSegMode(PSM.SINGLE_LINE if single_line else PSM.AUTO)
+            api.SetImage(image)
+            return api.GetUTF8Text().strip()
+
+    config = '--psm 7' if single_line else ''
+    return pytesseract.image_to_string(image, config=config).strip()
+
+
+def _iter_ocr_words(image: Image.Image) -> Iterator[Tuple[str, float, int, int, int, int]]:
+    """Run OCR on an image and yield (text, conf, left, top, width, height) per word.
+
+    Words are produced one at a time so callers can stop at the first match.
+    """
+    if TESSEROCR_AVAILABLE:
+        with _ocr_lock:
+            api = _get_ocr_api()
+            api.SetPageSegMode(PSM.AUTO)
+            api.SetImage(image)
+            api.Recognize()
+            iterator = api.GetIterator()
+            if iterator is None:
+                return
+            for word in iterate_level(iterator, RIL.WORD):
+                text = word.GetUTF8Text(RIL.WORD)
+                box = word.BoundingBox(RIL.WORD)
+                if not text or box is None:
+                    continue
+                left, top, right, bottom = box
+                yield (text, word.Confidence(RIL.WORD), left, top, right - left, bottom - top)
+        return
+
+    data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+    for i, text in enumerate(data.get('text', [])):
+        if text:
+            yield (
+                text,
+                float(data['conf'][i]),
+                data['left'][i],
+                data['top'][i],
+                data['width'][i],
+                data['height'][i],
+            )
+
+
+def _match_score(text: str, word: str) -> float:
+    """Score 0-100 for how well an OCR word matches the searched text."""
+    if RAPIDFUZZ_AVAILABLE:
+        # Fuzzy match tolerates OCR errors in the recognized words. Only the
+        # OCR word may contain the text: partial_ratio of a shorter word
+        # (e.g. a stray "a" when searching for "Save") would score 100
+        text = utils.default_process(text)
+        word = utils.default_process(word)
+        if len(word) >= len(text):
+            return fuzz.partial_ratio(text, word)
+        return fuzz.ratio(text, word)
+    return 100.0 if text.lower() in word.lower() else 0.0
+
 
 def get_active_window() -> Dict[str, str]:
     """Get information about the currently active window."""
@@ -67,8 +204,9 @@ def capture_screen_region(x: int, y: int, width: int = 200, height: int = 50) ->
         right = left + width
         bottom = top + height
         
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        return screenshot
+        screenshot = _get_cached_screenshot().crop((left, top, right, bottom))
+        # Tesseract binarizes internally; grayscale saves it the color work
+        return screenshot.convert("L")
     except Exception:
         return None
 
@@ -83,33 +221,133 @@ def extract_text_near_point(x: int, y: int, region_width: int = 200, region_heig
         if image is None:
             return ""
         
+        key = hashlib.blake2b(image.tobytes(), digest_size=8).digest()
+        with _ocr_cache_lock:
+            if key in _OCR_CACHE:
+                _OCR_CACHE.move_to_end(key)
+                return _OCR_CACHE[key]
+
         # Use OCR to extract text
-        text = pytesseract.image_to_string(image, config='--psm 7')
-        return text.strip()
+        text = _ocr_text(image, single_line=True)
+
+        with _ocr_cache_lock:
+            _OCR_CACHE[key] = text
+            if len(_OCR_CACHE) > _OCR_CACHE_MAX:
+                _OCR_CACHE.popitem(last=False)
+        return text
     except Exception as e:
         # Silently fail - OCR is optional
         return ""
 
 
+def _display_scale() -> float:
+    """System display scale (1.0 = 100%); 1.0 where it cannot be queried."""
+    try:
+        return ctypes.windll.user32.GetDpiForSystem() / 96
+    except Exception:
+        return 1.0
+
+
+def _screen_ocr_downscale() -> int:
+    """Largest integer shrink factor for full-screen OCR that keeps text readable."""
+    cap_height = UI_CAP_HEIGHT_PX * _display_scale()
+    return max(1, int(cap_height // OCR_MIN_CAP_HEIGHT_PX))
+
+
+def find_text_via_uia(text: str) -> Optional[Tuple[int, int]]:
+    """Find a control in the foreground window named like the text.
+
+    An exact (case-insensitive) name wins; otherwise the closest name
+    scoring at least TEXT_MATCH_CUTOFF is used.
+    """
+    if not UIA_AVAILABLE or not text:
+        return None
+
+    try:
+        target = text.strip().lower()
+        root = uiautomation.GetForegroundControl()
+        if root is None:
+            return None
+
+        found = None
+        found_score = -1.0
+
+        # The window itself is skipped: its title is not a click target
+        for count, (control, _) in enumerate(
+            uiautomation.WalkControl(root, includeTop=False, maxDepth=UIA_MAX_DEPTH)
+        ):
+            if count >= UIA_MAX_CONTROLS:
+                break
+            name = control.Name
+            if not name:
+                continue
+            exact = name.strip().lower() == target
+            if exact:
+                score = 100.0
+            elif RAPIDFUZZ_AVAILABLE:
+                # Whole-name ratio, so "Save" does not match "Save As..." or "Unsaved"
+                score = fuzz.ratio(text, name, processor=utils.default_process)
+                if score < TEXT_MATCH_CUTOFF or score <= found_score:
+                    continue
+            else:
+                continue
+
+            rect = control.BoundingRectangle
+            if rect.width() > 0 and rect.height() > 0:
+                found, found_score = (rect.xcenter(), rect.ycenter()), score
+                if exact:
+                    break
+
+        return found
+    except Exception:
+        return None
+
+
 def find_text_on_screen(text: str, confidence: float = 0.8) -> Optional[Tuple[int, int]]:
-    """Find text on screen using OCR and return its approximate location."""
+    """Find text on screen and return its approximate location.
+
+    UI Automation is tried first since it reads control names directly;
+    full-screen OCR is the fallback for apps it cannot introspect.
+    """
+    location = find_text_via_uia(text)
+    if location:
+        return location
+
     if not TESSERACT_AVAILABLE:
         return None
     
     try:
-        # Take full screenshot
-        screenshot = pyautogui.screenshot()
+        # Take full screenshot, grayscale and, on high-DPI displays,
+        # downscaled for faster OCR
+        screenshot = _get_cached_screenshot().convert("L")
+        scale = _screen_ocr_downscale()
+        if scale > 1:
+            screenshot = screenshot.resize(
+                (screenshot.width // scale, screenshot.height // scale), Image.BILINEAR
+            )
         
         # Use OCR to find text location
         # This is a simplified approach - in production, you'd want more sophisticated text matching
-        data = pytesseract.image_to_data(screenshot, output_type=pytesseract.Output.DICT)
+        ocr_cutoff = confidence * 100
+        found = None
+        found_score = -1.0
         
-        # Search for the text
-        for i, word in enumerate(data.get('text', [])):
-            if text.lower() in word.lower() and float(data.get('conf', [0])[i]) > confidence * 100:
-                x = data['left'][i] + data['width'][i] // 2
-                y = data['top'][i] + data['height'][i] // 2
-                return (x, y)
+        # Search for the text, stopping at the first exact match
+        with closing(_iter_ocr_words(screenshot)) as words:
+            for word in words:
+                if word[1] <= ocr_cutoff:
+                    continue
+                score = _match_score(text, word[0])
+                if score >= TEXT_MATCH_CUTOFF and score > found_score:
+                    found, found_score = word, score
+                    if score >= 100:
+                        break
+
+        if found:
+            _, _, left, top, width, height = found
+            x = (left + width // 2) * scale
+            y = (top + height // 2) * scale
+            return (x, y)
         
         return None
     except Exception:
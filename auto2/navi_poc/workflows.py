@@ -3,6 +3,16 @@ import uuid
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process, utils
+except ImportError:
+    process = None
+
 WORKFLOWS_PATH = Path(__file__).parent / "data" / "workflows.json"
 
 Workflow = Dict[str, object]
@@ -14,17 +24,55 @@ def load_workflows() -> List[Workflow]:
         WORKFLOWS_PATH.write_text("[]", encoding="utf-8")
 
     try:
-        return json.loads(WORKFLOWS_PATH.read_text(encoding="utf-8"))
+        if orjson is not None:
+            workflows = orjson.loads(WORKFLOWS_PATH.read_bytes())
+        else:
+            workflows = json.loads(WORKFLOWS_PATH.read_text(encoding="utf-8"))
     except json.JSONDecodeError:
         backup = WORKFLOWS_PATH.with_suffix(".corrupt.json")
         WORKFLOWS_PATH.rename(backup)
         WORKFLOWS_PATH.write_text("[]", encoding="utf-8")
         print(f"Corrupt workflows file. Backup saved to {backup}")
-        return []
+        workflows = []
+
+    # Fold workflows appended by add_workflow into the main file
+    pending = _read_journal()
+    if pending:
+        known = {workflow.get("id") for workflow in workflows}
+        workflows.extend(w for w in pending if w.get("id") not in known)
+        save_workflows(workflows)
+        _journal_path().unlink(missing_ok=True)
+
+    return workflows
 
 
 def save_workflows(workflows: List[Workflow]) -> None:
-    WORKFLOWS_PATH.write_text(json.dumps(workflows, indent=2), encoding="utf-8")
+    WORKFLOWS_PATH.write_bytes(_dumps([_strip_cache(w) for w in workflows]))
+
+
+def _dumps(workflows: List[Workflow]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(workflows, option=orjson.OPT_INDENT_2)
+    return json.dumps(workflows, indent=2).encode("utf-8")
+
+
+def _journal_path() -> Path:
+    return WORKFLOWS_PATH.with_suffix(".jsonl")
+
+
+def _read_journal() -> List[Workflow]:
+    path = _journal_path()
+    if not path.exists():
+        return []
+
+    workflows = []
+    for line in path.read_bytes().splitlines():
+        try:
+            workflows.append(json.loads(line) if orjson is None else orjson.loads(line))
+        except json.JSONDecodeError:
+            # Skip a partially written line
+            continue
+    return workflows
 
 
 def add_workflow(name: str, description: str, events: List[dict], understanding: Optional[Dict] = None) -> Workflow:
@@ -36,26 +84,51 @@ def add_workflow(name: str, description: str, events: List[dict], understanding:
     }
     if understanding:
         workflow["understanding"] = understanding
-    workflows = load_workflows()
-    workflows.append(workflow)
-    save_workflows(workflows)
+
+    # Append only the new workflow; load_workflows merges it into the
+    # indented file instead of re-serializing every saved event here
+    WORKFLOWS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        line = orjson.dumps(workflow)
+    else:
+        line = json.dumps(workflow).encode("utf-8")
+    with _journal_path().open("ab") as journal:
+        journal.write(line + b"\n")
     return workflow
 
 
 def find_best_workflow(command: str, workflows: List[Workflow]) -> Optional[Workflow]:
+    if process is not None and workflows:
+        match = process.extractOne(
+            command,
+            [workflow.get("description", "") for workflow in workflows],
+            scorer=fuzz.token_set_ratio,
+            processor=utils.default_process,
+        )
+        return workflows[match[2]] if match else None
+
     command_words = _tokenize(command)
-    best: Optional[Workflow] = None
-    best_score = -1
-
-    for workflow in workflows:
-        description = workflow.get("description", "")
-        desc_words = _tokenize(description)
-        score = len(command_words & desc_words)
-        if score > best_score:
-            best_score = score
-            best = workflow
-
-    return best
+    return max(
+        workflows,
+        key=lambda workflow: len(command_words & _desc_tokens(workflow)),
+        default=None,
+    )
+
+
+def _desc_tokens(workflow: Workflow) -> set[str]:
+    tokens = workflow.get("_desc_tokens")
+    if tokens is None:
+        tokens = workflow["_desc_tokens"] = _tokenize(workflow.get("description", ""))
+    return tokens
+
+
+def _strip_cache(workflow: Workflow) -> Workflow:
+    """Drop in-memory cache keys before a workflow is written to disk."""
+    if "_desc_tokens" not in workflow:
+        return workflow
+    workflow = dict(workflow)
+    workflow.pop("_desc_tokens")
+    return workflow
 
 
 def _tokenize(text: str) -> set[str]:
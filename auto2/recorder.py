@@ -1,7 +1,10 @@
 import base64
+import hashlib
 import io
+import queue
 import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -18,21 +21,66 @@ try:
 except ImportError:
     WINDOW_TRACKING_AVAILABLE = False
 
+try:
+    import win32gui
+    WINDOWS_API_AVAILABLE = True
+except ImportError:
+    WINDOWS_API_AVAILABLE = False
+
 try:
     from PIL import Image, ImageGrab
     SCREENSHOT_AVAILABLE = True
 except ImportError:
     SCREENSHOT_AVAILABLE = False
 
+try:
+    from tesserocr import PyTessBaseAPI
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
 try:
     import pytesseract
-    OCR_AVAILABLE = True
+    PYTESSERACT_AVAILABLE = True
 except ImportError:
-    OCR_AVAILABLE = False
+    PYTESSERACT_AVAILABLE = False
+
+# Prefer tesserocr (in-process); pytesseract runs the tesseract binary per call
+OCR_AVAILABLE = TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE
 
 
 Event = Dict[str, object]
 
+# Special keys recorded as "Key.<name>", precomputed instead of str(key)
+_KEY_NAMES: Dict[keyboard.Key, str] = {key: f"Key.{key.name}" for key in keyboard.Key}
+
+# Mouse moves only check for a window change once per this many moves
+MOVE_CONTEXT_SAMPLE = 64
+
+# Click regions are bucketed into cells of this many pixels for reuse
+REGION_CELL_SIZE = 50
+
+# Single tesserocr instance, created on first use and shared by all threads
+_ocr_api = None
+_ocr_lock = threading.Lock()
+
+
+def _ocr_text(img: "Image.Image") -> str:
+    """Run OCR on an image and return the recognized text."""
+    global _ocr_api
+    if TESSEROCR_AVAILABLE:
+        with _ocr_lock:
+            if _ocr_api is None:
+                _ocr_api = PyTessBaseAPI()
+            _ocr_api.SetImage(img)
+            return _ocr_api.GetUTF8Text().strip()
+    return pytesseract.image_to_string(img).strip()
+
+
+def _image_digest(img: "Image.Image") -> bytes:
+    """Hash of the raw pixel bytes; equal digests mean identical images."""
+    return hashlib.blake2b(img.tobytes(), digest_size=8).digest()
+
 
 class Recorder:
     """Capture mouse and keyboard activity with rich context until stopped."""
@@ -42,6 +90,7 @@ class Recorder:
         capture_screenshots: bool = True,
         capture_ocr: bool = True,
         screenshot_region_size: int = 200,
+        store_screenshots: bool = True,
     ) -> None:
         """
         Initialize the recorder.
@@ -50,6 +99,8 @@ class Recorder:
             capture_screenshots: Whether to capture screenshots at key moments
             capture_ocr: Whether to extract text from screenshots (requires OCR)
             screenshot_region_size: Size of region around click to capture (pixels)
+            store_screenshots: Whether to keep captured screenshots in events
+                (base64 PNG); when False they are only used for OCR
         """
         self.events: List[Event] = []
         self.start_time: Optional[float] = None
@@ -62,11 +113,25 @@ class Recorder:
         self.capture_screenshots = capture_screenshots and SCREENSHOT_AVAILABLE
         self.capture_ocr = capture_ocr and OCR_AVAILABLE and self.capture_screenshots
         self.screenshot_region_size = screenshot_region_size
+        self.store_screenshots = store_screenshots
         
         # Track current window context
         self._last_window_context: Optional[Dict[str, str]] = None
         self._last_context_check: float = 0.0
         self._context_check_interval: float = 0.5  # Check window every 0.5s
+        self._last_foreground: Optional[tuple] = None
+        self._move_sample_counter = 0
+
+        # OCR results keyed by a hash of the screenshot bytes
+        self._ocr_cache: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
+        self._ocr_cache_max = 512
+
+        # Screenshots are encoded and OCR'd on a worker, off the listeners
+        self._ocr_queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._ocr_thread: Optional[threading.Thread] = None
+
+        # (window title, cell x, cell y) -> (pixel digest, screenshot/OCR context)
+        self._region_cache: Dict[tuple, tuple] = {}
 
     # --------------------------------------------------------------------- API
     def start(self) -> None:
@@ -78,8 +143,16 @@ class Recorder:
         self.start_time = time.time()
         self._last_window_context = None
         self._last_context_check = 0.0
+        self._last_foreground = None
+        self._move_sample_counter = 0
         self._should_stop = False
 
+        if self.capture_screenshots:
+            self._region_cache = {}
+            self._ocr_queue = queue.Queue()
+            self._ocr_thread = threading.Thread(target=self._ocr_worker, daemon=True)
+            self._ocr_thread.start()
+
         # Record initial context
         self._record_context_event("recording_start")
 
@@ -118,6 +191,13 @@ class Recorder:
         self._mouse_listener = None
         self._keyboard_listener = None
 
+        if self._ocr_thread is not None:
+            # Wait for pending screenshots to be attached to their events
+            self._ocr_queue.join()
+            self._ocr_queue.put(None)
+            self._ocr_thread.join()
+            self._ocr_thread = None
+
         events = list(self.events)
         self.events = []
         self.start_time = None
@@ -147,13 +227,24 @@ class Recorder:
             return None
         
         # Throttle window checks
-        now = time.time()
+        now = time.monotonic()
         if now - self._last_context_check < self._context_check_interval:
             return self._last_window_context
         
         self._last_context_check = now
         
         try:
+            if WINDOWS_API_AVAILABLE:
+                # Same foreground window and title: skip pygetwindow's lookup
+                hwnd = win32gui.GetForegroundWindow()
+                foreground = (hwnd, win32gui.GetWindowText(hwnd))
+                if (
+                    foreground == self._last_foreground
+                    and self._last_window_context is not None
+                ):
+                    return self._last_window_context
+                self._last_foreground = foreground
+
             active_window = gw.getActiveWindow()
             if active_window:
                 context = {
@@ -181,10 +272,10 @@ class Recorder:
             event["window"] = context
         self._record(event)
 
-    def _capture_screenshot_region(
+    def _capture_pil(
         self, x: int, y: int, width: int, height: int
-    ) -> Optional[str]:
-        """Capture a region of the screen and return as base64 encoded image."""
+    ) -> Optional["Image.Image"]:
+        """Capture a region of the screen centred on a point."""
         if not self.capture_screenshots:
             return None
         
@@ -195,41 +286,108 @@ class Recorder:
             right = x + width // 2
             bottom = y + height // 2
             
-            # Capture screenshot
-            screenshot = ImageGrab.grab(bbox=(left, top, right, bottom))
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            screenshot.save(buffer, format="PNG")
-            img_bytes = buffer.getvalue()
-            img_base64 = base64.b64encode(img_bytes).decode("utf-8")
-            
-            return img_base64
+            return ImageGrab.grab(bbox=(left, top, right, bottom))
         except Exception as e:
             # Silently fail - screenshots are optional
             return None
 
-    def _extract_text_from_image(self, img_base64: str) -> Optional[str]:
-        """Extract text from a base64 encoded image using OCR."""
+    @staticmethod
+    def _pil_to_b64(img: "Image.Image") -> str:
+        """Encode an image as base64 PNG for storing in an event."""
+        buffer = io.BytesIO()
+        # Fastest zlib level: ~3x quicker than the default for slightly larger output
+        img.save(buffer, format="PNG", compress_level=1)
+        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+    def _extract_text_from_image(
+        self, img: "Image.Image", digest: Optional[bytes] = None
+    ) -> Optional[str]:
+        """Extract text from an image using OCR; digest is its _image_digest if known."""
         if not self.capture_ocr:
             return None
         
         try:
-            # Decode base64 image
-            img_bytes = base64.b64decode(img_base64)
-            img = Image.open(io.BytesIO(img_bytes))
-            
-            # Extract text
-            text = pytesseract.image_to_string(img).strip()
-            return text if text else None
+            # Identical regions (e.g. the same button clicked again) reuse OCR
+            key = digest if digest is not None else _image_digest(img)
+            if key in self._ocr_cache:
+                self._ocr_cache.move_to_end(key)
+                return self._ocr_cache[key]
+
+            # Tesseract binarizes internally; grayscale saves it the color work
+            text = _ocr_text(img.convert("L")) or None
+
+            self._ocr_cache[key] = text
+            if len(self._ocr_cache) > self._ocr_cache_max:
+                self._ocr_cache.popitem(last=False)
+            return text
         except Exception:
             return None
 
+    def _attach_screen_context(self, event: Event, x: int, y: int) -> None:
+        """Capture the region around a point; the worker adds it to the event."""
+        img = self._capture_pil(
+            x, y, self.screenshot_region_size, self.screenshot_region_size
+        )
+        if img is not None and self._ocr_thread is not None:
+            window = self._last_window_context or {}
+            region_key = (
+                window.get("title"),
+                x // REGION_CELL_SIZE,
+                y // REGION_CELL_SIZE,
+            )
+            self._ocr_queue.put((event, img, region_key))
+
+    def _ocr_worker(self) -> None:
+        """Add screenshots and/or OCR text to queued events until stopped."""
+        while True:
+            item = self._ocr_queue.get()
+            try:
+                if item is None:
+                    return
+                event, img, region_key = item
+
+                # A pixel-identical region at the same spot reuses its
+                # screenshot and OCR text instead of encoding and OCR'ing again.
+                # Only exact matches qualify: different labels can look alike
+                digest = _image_digest(img)
+                cached = self._region_cache.get(region_key)
+                if cached is not None and cached[0] == digest:
+                    context = dict(cached[1])
+                else:
+                    context = self._screen_context(img, digest)
+                    self._region_cache[region_key] = (digest, context)
+
+                with self._lock:
+                    event.update(context)
+            except Exception:
+                # Screenshots and OCR are optional
+                pass
+            finally:
+                self._ocr_queue.task_done()
+
+    def _screen_context(self, img: "Image.Image", digest: Optional[bytes] = None) -> Event:
+        """Encode the screenshot and/or extract its text for an event."""
+        context: Event = {}
+
+        if self.store_screenshots:
+            context["screenshot"] = self._pil_to_b64(img)
+
+        # Extract text from screenshot
+        if self.capture_ocr:
+            text = self._extract_text_from_image(img, digest)
+            if text:
+                context["ocr_text"] = text
+
+        return context
+
     # --------------------------------------------------------------- Listeners
     def _on_move(self, x: int, y: int) -> None:
         try:
             # Don't record every mouse move - too noisy
-            # Only record if window context changed
+            # Only record if window context changed, sampled every N moves
+            self._move_sample_counter += 1
+            if self._move_sample_counter % MOVE_CONTEXT_SAMPLE:
+                return
             context = self._get_window_context()
             if context != self._last_window_context:
                 self._record_context_event("window_change")
@@ -253,17 +411,7 @@ class Recorder:
             
             # Capture screenshot and OCR on click release (when action completes)
             if not pressed:  # On button release
-                screenshot = self._capture_screenshot_region(
-                    x, y, self.screenshot_region_size, self.screenshot_region_size
-                )
-                if screenshot:
-                    event["screenshot"] = screenshot
-                    
-                    # Extract text from screenshot
-                    if self.capture_ocr:
-                        text = self._extract_text_from_image(screenshot)
-                        if text:
-                            event["ocr_text"] = text
+                self._attach_screen_context(event, x, y)
             
             self._record(event)
         except Exception:
@@ -319,15 +467,7 @@ class Recorder:
                 try:
                     import pyautogui
                     x, y = pyautogui.position()
-                    screenshot = self._capture_screenshot_region(
-                        x, y, self.screenshot_region_size, self.screenshot_region_size
-                    )
-                    if screenshot:
-                        event["screenshot"] = screenshot
-                        if self.capture_ocr:
-                            text = self._extract_text_from_image(screenshot)
-                            if text:
-                                event["ocr_text"] = text
+                    self._attach_screen_context(event, x, y)
                 except Exception:
                     pass
             
@@ -350,7 +490,8 @@ class Recorder:
 
     @staticmethod
     def _normalize_key(key: keyboard.KeyCode | keyboard.Key) -> str:
-        try:
-            return key.char  # type: ignore[return-value]
-        except AttributeError:
-            return str(key)
+        if isinstance(key, keyboard.Key):
+            return _KEY_NAMES.get(key) or str(key)
+        # vk-only KeyCodes (numpad, media keys) have no char
+        ch = key.char
+        return ch if ch is not None else _KEY_NAMES.get(key, str(key))
@@ -12,6 +12,9 @@ except ImportError as exc:  # pragma: no cover - handled at runtime
 
 Event = Dict[str, object]
 
+# Special keys recorded as "Key.<name>", precomputed instead of str(key)
+_KEY_NAMES: Dict[keyboard.Key, str] = {key: f"Key.{key.name}" for key in keyboard.Key}
+
 
 class Recorder:
     """Capture mouse and keyboard activity until stopped."""
@@ -122,7 +125,8 @@ class Recorder:
 
     @staticmethod
     def _normalize_key(key: keyboard.KeyCode | keyboard.Key) -> str:
-        try:
-            return key.char  # type: ignore[return-value]
-        except AttributeError:
-            return str(key)
+        if isinstance(key, keyboard.Key):
+            return _KEY_NAMES.get(key) or str(key)
+        # vk-only KeyCodes (numpad, media keys) have no char
+        ch = key.char
+        return ch if ch is not None else _KEY_NAMES.get(key, str(key))
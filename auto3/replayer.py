@@ -13,6 +13,9 @@ pyautogui.PAUSE = 0
 
 Event = Dict[str, object]
 
+# Shorter waits than this are skipped rather than slept
+MIN_SLEEP = 0.001
+
 
 KEY_ALIASES = {
     "Key.space": "space",
@@ -34,13 +37,15 @@ def replay(events: Iterable[Event]) -> None:
         print("No events to replay.")
         return
 
+    # Sleep until each event's offset from a fixed start so delays don't drift
+    start = time.monotonic()
     previous_time = 0.0
     for event in events_list:
         event_time = float(event.get("t", previous_time))
-        delay = max(0.0, event_time - previous_time)
-        if delay:
-            time.sleep(delay)
         previous_time = event_time
+        slack = start + event_time - time.monotonic()
+        if slack > MIN_SLEEP:
+            time.sleep(slack)
 
         event_type = event.get("type")
         if event_type == "mouse_move":
@@ -0,0 +1,44 @@
+# _cache.py
+# On-disk pickle cache for the symbolic tensors, so repeated runs of the step
+# scripts skip the symbolic build entirely.
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent / ".darling_cache"
+
+
+def cache_key(*parts):
+    """Short hash of the given strings (e.g. sp.srepr of the metric)."""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cached(name, build_fn, key):
+    """Return the pickled value for (name, key), building and storing it on a miss."""
+    path = CACHE_DIR / f"{name}_{key}.pkl"
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        # Corrupt or incompatible cache file; rebuild it
+        pass
+
+    value = build_fn()
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Caching is best effort
+        pass
+    return value
@@ -2,61 +2,99 @@
 # Converts equation outputs from step1.py into regular mathematical syntax (LaTeX)
 
 import sys
-import re
-import subprocess
-from io import StringIO
 
 try:
     import sympy as sp
-    from sympy.printing.latex import latex
+    from sympy.printing.latex import LatexPrinter
+    from sympy.printing.str import StrPrinter
 except ImportError:
     print("Error: sympy is required. Please install it with: pip install sympy")
     sys.exit(1)
 
+from tensors import get_gamma
+
+
+class ChristoffelLatexPrinter(LatexPrinter):
+    r"""
+    LaTeX with α(t, r) printed as \alpha, derivatives as \partial_t \alpha and
+    trig functions of a bare symbol as \sin\theta, directly from the tree.
+    """
+
+    def doprint(self, expr):
+        # 1/tan(θ) -> cot(θ)
+        expr = expr.replace(
+            lambda e: e.is_Pow and isinstance(e.base, sp.tan) and e.exp == -1,
+            lambda e: sp.cot(e.base.args[0]),
+        )
+        return super().doprint(expr)
+
+    def _print_AppliedUndef(self, expr, exp=None):
+        name = self._print(sp.Symbol(expr.func.__name__))
+        return f"{name}^{{{exp}}}" if exp else name
+
+    def _print_Derivative(self, expr):
+        partials = ' '.join(
+            rf"\partial_{self._print(var)}" + (f"^{{{count}}}" if count > 1 else '')
+            for var, count in expr.variable_count
+        )
+        return f"{partials} {self._print(expr.expr)}"
+
+    def _print_Function(self, expr, exp=None):
+        if isinstance(expr, (sp.sin, sp.cos, sp.tan, sp.cot)):
+            name = '\\' + expr.func.__name__ + (f"^{exp}" if exp else '')
+            arg = expr.args[0]
+            if arg.is_Symbol:
+                return name + self._print(arg)
+            return f"{name}({self._print(arg)})"
+        return super()._print_Function(expr, exp)
+
+
+_LATEX = ChristoffelLatexPrinter()
+
+
+_SUPERSCRIPTS = str.maketrans('0123456789', '⁰¹²³⁴⁵⁶⁷⁸⁹')
+
+
+class ReadablePrinter(StrPrinter):
+    """
+    str() output with Greek names, ∂α/∂t derivatives and e^(...) exponentials,
+    produced in a single walk over the expression tree.
+    """
+    _GREEK = {'alpha': 'α', 'beta': 'β', 'theta': 'θ', 'phi': 'φ'}
+
+    def _print_Symbol(self, expr):
+        return self._GREEK.get(expr.name, expr.name)
+
+    def _print_AppliedUndef(self, expr):
+        # α(t, r) -> α
+        name = expr.func.__name__
+        return self._GREEK.get(name, name)
+
+    def _print_Derivative(self, expr):
+        order = sum(count for _, count in expr.variable_count)
+        numerator = '∂' + (str(order).translate(_SUPERSCRIPTS) if order > 1 else '')
+        denominator = ''.join(
+            '∂' + self._print(var) + (str(count).translate(_SUPERSCRIPTS) if count > 1 else '')
+            for var, count in expr.variable_count
+        )
+        return f"{numerator}{self._print(expr.expr)}/{denominator}"
+
+    def _print_exp(self, expr):
+        return f"e^({self._print(expr.exp)})"
+
+
+_READABLE = ReadablePrinter()
+
 
 def convert_sympy_output_to_latex():
     """
-    Runs step1.py, captures its output, and converts SymPy expressions to LaTeX.
+    Converts the Christoffel symbols printed by step1.py to LaTeX.
     """
-    print("Running step1.py and converting outputs to LaTeX format...\n")
+    print("Computing step1.py Christoffel symbols and converting to LaTeX format...\n")
     print("=" * 70)
     
-    # Read and execute step1.py while suppressing print statements
-    # This avoids Unicode encoding issues with print statements
-    try:
-        # Read step1.py
-        with open('step1.py', 'r', encoding='utf-8') as f:
-            code = f.read()
-        
-        # Comment out all print statements to avoid encoding issues
-        lines = code.split('\n')
-        modified_lines = []
-        for line in lines:
-            # Comment out lines that contain print statements
-            if 'print(' in line and not line.strip().startswith('#'):
-                # Indent the comment to match original indentation
-                indent = len(line) - len(line.lstrip())
-                modified_lines.append(' ' * indent + '# ' + line.lstrip())
-            else:
-                modified_lines.append(line)
-        
-        code = '\n'.join(modified_lines)
-        
-        # Execute the modified code in a namespace
-        namespace = {}
-        exec(compile(code, 'step1.py', 'exec'), namespace)
-        
-        # Get the Gamma array
-        Γ = namespace['Gamma']
-        
-    except FileNotFoundError:
-        print("Error: Could not find step1.py. Make sure it's in the same directory.")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error processing step1.py: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    # Same Γ tensor as step1.py, built once and shared by both modes
+    Γ = get_gamma()
     
     # Define the Christoffel symbols to convert (same as in step1.py)
     symbols_to_print = [
@@ -80,72 +118,7 @@ def convert_sympy_output_to_latex():
         mu, nu, rho = indices
         expr = Γ[mu][nu][rho]
         
-        # Convert to LaTeX with better formatting
-        # Use mode='inline' for better function representation
-        latex_expr = latex(expr, mode='plain')
-        
-        # Replace alpha with function arguments with just α
-        latex_expr = re.sub(r'\\alpha\{t,r\s*\}', r'\\alpha', latex_expr)
-        latex_expr = re.sub(r'\\alpha\{\\left\(t,r\s*\\right\)\}', r'\\alpha', latex_expr)
-        latex_expr = re.sub(r'\\alpha\\left\(t, r\\right\)', r'\\alpha', latex_expr)
-        latex_expr = re.sub(r'\\alpha\{\\left\(t,\s*r\s*\\right\)\}', r'\\alpha', latex_expr)
-        latex_expr = re.sub(r'\\operatorname\{alpha\}\\left\(t, r\\right\)', r'\\alpha', latex_expr)
-        
-        # Replace beta with function arguments with just β
-        latex_expr = re.sub(r'\\beta\{t,r\s*\}', r'\\beta', latex_expr)
-        latex_expr = re.sub(r'\\beta\{\\left\(t,r\s*\\right\)\}', r'\\beta', latex_expr)
-        latex_expr = re.sub(r'\\beta\\left\(t, r\\right\)', r'\\beta', latex_expr)
-        latex_expr = re.sub(r'\\beta\{\\left\(t,\s*r\s*\\right\)\}', r'\\beta', latex_expr)
-        latex_expr = re.sub(r'\\operatorname\{beta\}\\left\(t, r\\right\)', r'\\beta', latex_expr)
-        
-        # Remove any remaining function argument patterns for alpha and beta
-        latex_expr = re.sub(r'\\alpha\{[^}]+\}', r'\\alpha', latex_expr)
-        latex_expr = re.sub(r'\\beta\{[^}]+\}', r'\\beta', latex_expr)
-        
-        # Replace partial derivatives: \frac{\partial}{\partial t} alpha -> \partial_t \alpha
-        latex_expr = re.sub(
-            r'\\frac\{\\partial\}\{\\partial\s+t\}\s*\\alpha',
-            r'\\partial_t \\alpha',
-            latex_expr
-        )
-        latex_expr = re.sub(
-            r'\\frac\{\\partial\}\{\\partial\s+r\}\s*\\alpha',
-            r'\\partial_r \\alpha',
-            latex_expr
-        )
-        latex_expr = re.sub(
-            r'\\frac\{\\partial\}\{\\partial\s+t\}\s*\\beta',
-            r'\\partial_t \\beta',
-            latex_expr
-        )
-        latex_expr = re.sub(
-            r'\\frac\{\\partial\}\{\\partial\s+r\}\s*\\beta',
-            r'\\partial_r \\beta',
-            latex_expr
-        )
-        
-        # Replace exp with e^
-        latex_expr = re.sub(r'\\exp\\left\\(([^)]+)\\right\\)', r'e^{{\1}}', latex_expr)
-        latex_expr = re.sub(r'e\^(-?\s*\d+)\s*', r'e^{{\1}}', latex_expr)
-        
-        # Replace sin and cos notation - fix escaped backslashes first
-        latex_expr = latex_expr.replace(r'\\theta', r'\theta')
-        latex_expr = latex_expr.replace(r'\\phi', r'\phi')
-        latex_expr = re.sub(r'\\sin\^\{2\}\{.*?\\theta.*?\}', r'\\sin^2\\theta', latex_expr)
-        latex_expr = latex_expr.replace(r'\sin{\left(\theta \right)}', r'\sin\theta')
-        latex_expr = latex_expr.replace(r'\cos{\left(\theta \right)}', r'\cos\theta')
-        latex_expr = re.sub(r'\\sin\{2\s*\\theta\s*\}', r'\\sin(2\\theta)', latex_expr)
-        latex_expr = re.sub(r'\\sin\{\\left\(2\s*\\theta\s*\\right\)\}', r'\\sin(2\\theta)', latex_expr)
-        
-        # Fix tan to cot where appropriate
-        latex_expr = re.sub(r'\\frac\{1\}\{.*?tan.*?\\theta.*?\}', r'\\cot\\theta', latex_expr)
-        latex_expr = re.sub(r'\\frac\{1\}\{.*?\\tan.*?\\theta.*?\}', r'\\cot\\theta', latex_expr)
-        # Remove specific stray closing braces (like }\} at end of cot\theta)
-        latex_expr = re.sub(r'\\cot\\theta\}\}$', r'\\cot\\theta', latex_expr)
-        
-        # Clean up spacing
-        latex_expr = re.sub(r'\s+', ' ', latex_expr)
-        latex_expr = latex_expr.strip()
+        latex_expr = _LATEX.doprint(expr)
         
         print(f"{latex_name} = ${latex_expr}$\n")
 
@@ -155,40 +128,10 @@ def convert_to_readable_math():
     Alternative: Converts to a more human-readable mathematical notation
     without full LaTeX.
     """
-    print("Running step1.py and converting outputs to readable mathematical format...\n")
+    print("Computing step1.py Christoffel symbols and converting to readable mathematical format...\n")
     print("=" * 70)
     
-    # Read and execute step1.py while suppressing print statements
-    try:
-        # Read step1.py
-        with open('step1.py', 'r', encoding='utf-8') as f:
-            code = f.read()
-        
-        # Comment out all print statements
-        lines = code.split('\n')
-        modified_lines = []
-        for line in lines:
-            if 'print(' in line and not line.strip().startswith('#'):
-                indent = len(line) - len(line.lstrip())
-                modified_lines.append(' ' * indent + '# ' + line.lstrip())
-            else:
-                modified_lines.append(line)
-        
-        code = '\n'.join(modified_lines)
-        
-        # Execute the modified code
-        namespace = {}
-        exec(compile(code, 'step1.py', 'exec'), namespace)
-        Γ = namespace['Gamma']
-        
-    except FileNotFoundError:
-        print("Error: Could not find step1.py. Make sure it's in the same directory.")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error processing step1.py: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    Γ = get_gamma()
     
     symbols_to_print = [
         ((0, 0, 0), 'Γᵗₜₜ'),
@@ -211,25 +154,7 @@ def convert_to_readable_math():
         mu, nu, rho = indices
         expr = Γ[mu][nu][rho]
         
-        # Convert to string and clean up
-        expr_str = str(expr)
-        
-        # Replace function notation
-        expr_str = expr_str.replace('alpha(t, r)', 'α')
-        expr_str = expr_str.replace('beta(t, r)', 'β')
-        
-        # Replace Derivative notation
-        expr_str = re.sub(r'Derivative\(alpha\(t, r\), t\)', '∂α/∂t', expr_str)
-        expr_str = re.sub(r'Derivative\(alpha\(t, r\), r\)', '∂α/∂r', expr_str)
-        expr_str = re.sub(r'Derivative\(beta\(t, r\), t\)', '∂β/∂t', expr_str)
-        expr_str = re.sub(r'Derivative\(beta\(t, r\), r\)', '∂β/∂r', expr_str)
-        
-        # Replace exp
-        expr_str = expr_str.replace('exp', 'e')
-        
-        # Replace sin, cos
-        expr_str = expr_str.replace('sin(theta)', 'sin(θ)')
-        expr_str = expr_str.replace('cos(theta)', 'cos(θ)')
+        expr_str = _READABLE.doprint(expr)
         
         print(f"{name} = {expr_str}\n")
 
@@ -0,0 +1,110 @@
+# numeric.py
+# Numeric evaluators for the symbolic tensors in tensors.py.
+# α, β and their derivatives become plain arguments, so a component can be
+# evaluated at many points (e.g. along a geodesic) without touching SymPy.
+
+import sympy as sp
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+from tensors import (
+    GAMMA_INDICES,
+    RIEMANN_INDICES,
+    alpha,
+    beta,
+    coords,
+    get_gamma,
+    get_ricci,
+    get_riemann,
+    r,
+    t,
+)
+
+# Plain symbols standing in for α, β and their first derivatives
+a, b, da_t, da_r, db_t, db_r = sp.symbols('a b da_t da_r db_t db_r', real=True)
+
+# Second derivatives, which appear in Riemann and Ricci
+d2a_tt, d2a_tr, d2a_rr, d2b_tt, d2b_tr, d2b_rr = sp.symbols(
+    'd2a_tt d2a_tr d2a_rr d2b_tt d2b_tr d2b_rr', real=True
+)
+
+# Argument order of every compiled Γ component
+GAMMA_ARGS = (*coords, a, b, da_t, da_r, db_t, db_r)
+# ... and of every compiled Riemann/Ricci component
+RIEMANN_ARGS = (*GAMMA_ARGS, d2a_tt, d2a_tr, d2a_rr, d2b_tt, d2b_tr, d2b_rr)
+
+# Independent Ricci components: R_{νσ} is symmetric
+RICCI_INDICES = [(nu, sigma) for nu in range(4) for sigma in range(nu, 4)]
+
+# xreplace matches whole nodes first, so ∂α is replaced before α inside it
+_FIELD_SUBS = {
+    sp.diff(alpha, t, 2): d2a_tt,
+    sp.diff(alpha, t, r): d2a_tr,
+    sp.diff(alpha, r, 2): d2a_rr,
+    sp.diff(beta, t, 2): d2b_tt,
+    sp.diff(beta, t, r): d2b_tr,
+    sp.diff(beta, r, 2): d2b_rr,
+    sp.Derivative(alpha, t): da_t,
+    sp.Derivative(alpha, r): da_r,
+    sp.Derivative(beta, t): db_t,
+    sp.Derivative(beta, r): db_r,
+    alpha: a,
+    beta: b,
+}
+
+
+def compile_expr(expr, args=GAMMA_ARGS):
+    """Compile one component to a float function of args (JIT'd if numba is available)."""
+    fn = sp.lambdify(args, expr.xreplace(_FIELD_SUBS), "math")
+    if NUMBA_AVAILABLE:
+        fn = numba.njit(fn)
+    return fn
+
+
+def compile_tensor(T, args=GAMMA_ARGS):
+    """Compile every component of a nested-list tensor, keeping its shape."""
+    if isinstance(T, list):
+        return [compile_tensor(component, args) for component in T]
+    return compile_expr(sp.sympify(T), args)
+
+
+def compile_gamma():
+    """Γ^μ_{νρ} as a nested 4x4x4 list of functions of GAMMA_ARGS."""
+    return compile_tensor(get_gamma())
+
+
+def compile_batch(exprs, args):
+    """
+    One function of args returning every expression as a tuple. lambdify's
+    cse=True shares e^{2α}, sin θ, ... across the components instead of
+    recomputing them per component.
+    """
+    fn = sp.lambdify(args, tuple(expr.xreplace(_FIELD_SUBS) for expr in exprs), "math", cse=True)
+    if NUMBA_AVAILABLE:
+        fn = numba.njit(fn)
+    return fn
+
+
+def compile_gamma_batch():
+    """Independent Γ components, ordered like GAMMA_INDICES, as one function of GAMMA_ARGS."""
+    Gamma = get_gamma()
+    return compile_batch([Gamma[mu][nu][rho] for mu, nu, rho in GAMMA_INDICES], GAMMA_ARGS)
+
+
+def compile_riemann_batch():
+    """Independent Riemann components, ordered like RIEMANN_INDICES, as one function of RIEMANN_ARGS."""
+    Riemann = get_riemann()
+    return compile_batch(
+        [Riemann[mu][nu][rho][sigma] for mu, nu, rho, sigma in RIEMANN_INDICES],
+        RIEMANN_ARGS,
+    )
+
+
+def compile_ricci_batch():
+    """Independent Ricci components, ordered like RICCI_INDICES, as one function of RIEMANN_ARGS."""
+    Ricci = get_ricci()
+    return compile_batch([Ricci[nu][sigma] for nu, sigma in RICCI_INDICES], RIEMANN_ARGS)
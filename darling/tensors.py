@@ -0,0 +1,257 @@
+# tensors.py
+# Shared metric, Christoffel, Riemann and Ricci construction for the step scripts.
+# Each tensor is built once per metric ansatz and reused by later stages.
+
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import sympy as sp
+from sympy.functions.elementary.trigonometric import TrigonometricFunction
+
+from _cache import cache_key, cached
+
+# Optional C++ backend for the raw Riemann algebra. Checked to print the same
+# step2-step4 output as the pure SymPy path (SymPy 1.14, SymEngine 0.14)
+try:
+    import symengine as se
+    SYMENGINE_AVAILABLE = True
+except ImportError:
+    SYMENGINE_AVAILABLE = False
+
+# Riemann components are independent; simplify them in this many processes
+RIEMANN_WORKERS = os.cpu_count() or 1
+
+# ----------------------------------------------------
+# 1. Coordinates and metric functions
+# ----------------------------------------------------
+t, r, theta, phi = sp.symbols('t r theta phi', real=True)
+coords = [t, r, theta, phi]
+
+alpha = sp.Function('alpha')(t, r)
+beta  = sp.Function('beta')(t, r)
+
+# SymEngine has no assumptions; its plain symbols map back to the real ones
+_se_coords = [se.Symbol(x.name) for x in coords] if SYMENGINE_AVAILABLE else None
+_FROM_SYMENGINE = {sp.Symbol(x.name): x for x in coords}
+
+
+# Repeated sub-expressions (e.g. derivatives of the same metric entry) are
+# hashable, so diff/simplify results are reused across all components
+@functools.lru_cache(maxsize=None)
+def cached_diff(expr, var):
+    return sp.diff(expr, var)
+
+
+@functools.lru_cache(maxsize=None)
+def cached_simplify(expr):
+    # The components are rational in exp(2α), exp(2β), r and trig(θ);
+    # these targeted passes handle most of them far cheaper than sp.simplify
+    result = sp.powsimp(sp.trigsimp(sp.cancel(sp.expand(expr))))
+    # Trig left over can hide an identity (e.g. a Riemann component that is
+    # identically zero); Fu's trig rules collapse those, kept only if shorter
+    if result.has(TrigonometricFunction):
+        reduced = sp.fu(result)
+        if sp.count_ops(reduced) < sp.count_ops(result):
+            result = reduced
+    return result
+
+
+@functools.cache
+def get_metric(a=alpha, b=beta):
+    """
+    Diagonal entries of the metric and its inverse for
+    ds^2 = -e^{2a} dt^2 + e^{2b} dr^2 + r^2 dθ^2 + r^2 sin^2θ dφ^2
+    """
+    # Only the diagonal is nonzero; plain tuples skip Matrix indexing overhead
+    g_diag = (
+        -sp.exp(2*a),          # g_tt
+         sp.exp(2*b),          # g_rr
+         r**2,                 # g_θθ
+         r**2*sp.sin(theta)**2 # g_φφ
+    )
+    # The inverse of a diagonal metric is diag(1/g_ii); no general inversion needed
+    g_inv_diag = tuple(1/x for x in g_diag)
+    return g_diag, g_inv_diag
+
+
+def metric_entry(g_diag, i, j):
+    """g_{ij} (or g^{ij}) of a diagonal metric."""
+    return g_diag[i] if i == j else sp.S.Zero
+
+
+def _tensor_key(a, b):
+    """
+    Disk cache key: the metric itself plus this file and the SymPy and
+    SymEngine versions, so changing the ansatz, the construction code or the
+    backend invalidates old entries.
+    """
+    symengine_version = se.__version__ if SYMENGINE_AVAILABLE else "none"
+    return cache_key(sp.srepr(get_metric(a, b)), _SOURCE, sp.__version__, symengine_version)
+
+
+_SOURCE = Path(__file__).read_text(encoding="utf-8")
+
+
+@functools.cache
+def get_metric_derivatives(a=alpha, b=beta):
+    """Table dg[n][i] = ∂_n g_{ii}; off-diagonal entries and their derivatives vanish."""
+    g_diag, _ = get_metric(a, b)
+    return tuple(
+        tuple(sp.diff(g_diag[i], coords[n]) for i in range(4)) for n in range(4)
+    )
+
+
+# ----------------------------------------------------
+# 2. Christoffel symbols Γ^μ_{νρ}
+# ----------------------------------------------------
+# Independent components: Γ^μ_{νρ} = Γ^μ_{ρν}, so only ρ >= ν is computed
+GAMMA_INDICES = [
+    (mu, nu, rho) for mu in range(4) for nu in range(4) for rho in range(nu, 4)
+]
+
+
+def Gamma_symbol(dg, g_inv_diag, mu, nu, rho):
+    """
+    Compute Christoffel symbol Γ^μ_{νρ} using the standard formula:
+    Γ^μ_{νρ} = 1/2 g^{μλ} (∂_ν g_{λρ} + ∂_ρ g_{λν} - ∂_λ g_{νρ})
+    Indices: mu,nu,rho = 0..3 corresponding to t,r,θ,φ.
+    dg is the table from get_metric_derivatives().
+    """
+    # g is diagonal, so g^{μλ} vanishes unless λ = μ
+    lam = mu
+    term = (
+        metric_entry(dg[nu], lam, rho)
+        + metric_entry(dg[rho], lam, nu)
+        - metric_entry(dg[lam], nu, rho)
+    )
+    return cached_simplify(sp.Rational(1, 2)*g_inv_diag[mu]*term)
+
+
+@functools.cache
+def get_gamma(a=alpha, b=beta):
+    """All Γ^μ_{νρ} as a nested 4x4x4 list."""
+    return cached("gamma", lambda: _build_gamma(a, b), _tensor_key(a, b))
+
+
+def _build_gamma(a, b):
+    _, g_inv_diag = get_metric(a, b)
+    dg = get_metric_derivatives(a, b)
+    Gamma = [[ [None for _ in range(4)] for _ in range(4)] for _ in range(4)]
+    for mu, nu, rho in GAMMA_INDICES:
+        Gamma[mu][nu][rho] = Gamma[mu][rho][nu] = Gamma_symbol(dg, g_inv_diag, mu, nu, rho)
+    return Gamma
+
+
+@functools.cache
+def get_gamma_cse(a=alpha, b=beta):
+    """
+    Common subexpressions (e^{2a}, e^{-2b}, sin θ, ...) of the independent Γ
+    components, as returned by sp.cse: (replacements, reduced), with reduced
+    ordered like GAMMA_INDICES. Use this compact form for code generation.
+    """
+    Gamma = get_gamma(a, b)
+    return sp.cse([Gamma[mu][nu][rho] for mu, nu, rho in GAMMA_INDICES])
+
+
+# ----------------------------------------------------
+# 3. Riemann tensor R^μ_{νρσ} and Ricci tensor R_{νσ}
+# ----------------------------------------------------
+def _to_backend(Gamma):
+    """Γ as SymEngine expressions when available, so the raw diff/mul/add runs in C++."""
+    if not SYMENGINE_AVAILABLE:
+        return Gamma
+    return [[[se.sympify(x) for x in row] for row in plane] for plane in Gamma]
+
+
+def _diff(expr, i):
+    """∂_i of a Γ component, in whichever backend holds it."""
+    if isinstance(expr, sp.Basic):
+        return cached_diff(expr, coords[i])
+    return expr.diff(_se_coords[i])
+
+
+def _to_sympy(expr):
+    if isinstance(expr, sp.Basic):
+        return expr
+    return sp.sympify(expr).xreplace(_FROM_SYMENGINE)
+
+
+def Riemann_symbol(Gamma, mu, nu, rho, sigma):
+    """
+    R^μ_{νρσ} = ∂_ρ Γ^μ_{νσ} - ∂_σ Γ^μ_{νρ}
+               + Γ^μ_{λρ} Γ^λ_{νσ} - Γ^μ_{λσ} Γ^λ_{νρ}
+    Gamma may hold SymPy or SymEngine expressions; the result is simplified in SymPy.
+    """
+    term1 = _diff(Gamma[mu][nu][sigma], rho)
+    term2 = _diff(Gamma[mu][nu][rho], sigma)
+    term3 = 0
+    term4 = 0
+    # Most Γ components vanish; only sum over λ with a nonzero first factor
+    for lam in range(4):
+        if Gamma[mu][lam][rho] != 0:
+            term3 += Gamma[mu][lam][rho] * Gamma[lam][nu][sigma]
+        if Gamma[mu][lam][sigma] != 0:
+            term4 += Gamma[mu][lam][sigma] * Gamma[lam][nu][rho]
+    return cached_simplify(_to_sympy(term1 - term2 + term3 - term4))
+
+
+# Independent components: R^μ_{νρσ} = -R^μ_{νσρ}, so only ρ < σ is computed
+RIEMANN_INDICES = [
+    (mu, nu, rho, sigma)
+    for mu in range(4) for nu in range(4)
+    for rho in range(4) for sigma in range(rho + 1, 4)
+]
+
+_worker_gamma = None
+
+
+def _init_riemann_worker(Gamma):
+    global _worker_gamma
+    _worker_gamma = _to_backend(Gamma)
+
+
+def _riemann_worker(index):
+    return Riemann_symbol(_worker_gamma, *index)
+
+
+@functools.cache
+def get_riemann(a=alpha, b=beta):
+    """Riemann tensor with one index up, as a nested 4x4x4x4 list."""
+    return cached("riemann", lambda: _build_riemann(a, b), _tensor_key(a, b))
+
+
+def _build_riemann(a, b):
+    Gamma = get_gamma(a, b)
+    indices = RIEMANN_INDICES
+    if RIEMANN_WORKERS > 1:
+        # Γ is sent to each worker once, then only index tuples are passed
+        with ProcessPoolExecutor(
+            RIEMANN_WORKERS, initializer=_init_riemann_worker, initargs=(Gamma,)
+        ) as pool:
+            values = list(pool.map(_riemann_worker, indices, chunksize=16))
+    else:
+        Gamma = _to_backend(Gamma)
+        values = [Riemann_symbol(Gamma, *index) for index in indices]
+
+    # Antisymmetry in the last pair: zero on the diagonal, negated below it
+    Riemann = [[[[sp.S.Zero for _ in range(4)] for _ in range(4)]
+                for _ in range(4)] for _ in range(4)]
+    for (mu, nu, rho, sigma), value in zip(indices, values):
+        Riemann[mu][nu][rho][sigma] = value
+        Riemann[mu][nu][sigma][rho] = -value
+    return Riemann
+
+
+@functools.cache
+def get_ricci(a=alpha, b=beta):
+    """Ricci tensor R_{νσ} = R^μ_{νμσ}, as a nested 4x4 list."""
+    return cached("ricci", lambda: _build_ricci(a, b), _tensor_key(a, b))
+
+
+def _build_ricci(a, b):
+    # Contract the upper index with the first lower one (axes 0 and 2)
+    contracted = sp.tensorcontraction(sp.Array(get_riemann(a, b)), (0, 2))
+    return [[cached_simplify(contracted[nu, sigma]) for sigma in range(4)]
+            for nu in range(4)]
@@ -1,11 +1,44 @@
 import cv2
 import numpy as np
 
+from model_files import fetch_model
+from overlays import CachedText, GazeIndicator, Text, TextStamp, gaze_direction_text
+from pipeline import open_camera, run_pipeline
+
+YUNET_URL = (
+    "https://github.com/opencv/opencv_zoo/raw/main/models/"
+    "face_detection_yunet/face_detection_yunet_2023mar.onnx"
+)
+
+# Faces are detected on a frame downscaled by this factor (320x240 at 480p)
+DETECTION_SCALE = 0.5
+
 class EyeTrackerOpenCV:
     def __init__(self):
-        # Load pre-trained Haar Cascade classifiers
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
+        # YuNet face detector: one small DNN pass that also returns both eye
+        # centers, replacing the face and eye Haar cascade scans
+        try:
+            model_path = fetch_model("face_detection_yunet_2023mar.onnx", YUNET_URL)
+        except OSError as e:  # includes urllib.error.URLError
+            # Offline without the model: the bundled Haar cascades still work
+            print(f"Could not download the YuNet face model ({e}); "
+                  "falling back to Haar cascades")
+            model_path = None
+        
+        if model_path is not None:
+            self.face_detector = cv2.FaceDetectorYN.create(
+                model_path,
+                "",
+                (320, 320),
+                score_threshold=0.8,
+                backend_id=cv2.dnn.DNN_BACKEND_OPENCV,
+                target_id=cv2.dnn.DNN_TARGET_OPENCL
+            )
+        else:
+            self.face_detector = None
+            self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+            self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
+        self.detector_size = None
         
         # For pupil detection
         self.pupil_params = cv2.SimpleBlobDetector_Params()
@@ -21,9 +54,26 @@ class EyeTrackerOpenCV:
         
         self.detector = cv2.SimpleBlobDetector_create(self.pupil_params)
         
-        # Smoothing buffer for gaze position
-        self.gaze_history = []
+        # Mean darkness (above the ROI average) needed to trust the dark centroid
+        self.min_pupil_weight = 5.0
+        
+        # Smoothing buffer for gaze position (ring buffer of the last few samples)
         self.history_size = 5
+        self.gaze_history = np.zeros((self.history_size, 2))
+        self.gaze_index = 0
+        self.gaze_count = 0
+        
+        # Overlay parts that never change, rendered once
+        self.gaze_indicator = GazeIndicator()
+        self.quit_text = TextStamp("Press 'q' to quit", 0.5, (200, 200, 200))
+        self.no_face_text = TextStamp("No face detected", 1, (0, 0, 255), 2)
+        
+        # Labels from a small set reuse their rendered stamps; coordinates
+        # change every frame, so they go straight to putText
+        self.gaze_text = CachedText(1, (0, 255, 0), 2)
+        self.coord_text = Text(0.7, (255, 255, 255), 2)
+        self.eye_count_text = CachedText(0.6, (200, 200, 200), 1)
+        self.tracking_failed_text = TextStamp("Eyes detected but tracking failed", 0.7, (0, 165, 255), 2)
         
     def detect_pupil(self, eye_roi):
         """Detect pupil in eye region"""
@@ -33,7 +83,17 @@ class EyeTrackerOpenCV:
         else:
             gray_eye = eye_roi
         
-        # Apply thresholding
+        # Dark centroid: weight each pixel by how much darker than average it is.
+        # One vectorized pass, no thresholding or blob filtering
+        darkness = 255.0 - gray_eye
+        weights = np.maximum(darkness - darkness.mean(), 0)
+        total = weights.sum()
+        if total >= self.min_pupil_weight * weights.size:
+            cx = weights.sum(axis=0) @ np.arange(weights.shape[1]) / total
+            cy = weights.sum(axis=1) @ np.arange(weights.shape[0]) / total
+            return (int(cx), int(cy))
+        
+        # Low contrast ROI: fall back to thresholding + blob detection
         _, threshold = cv2.threshold(gray_eye, 50, 255, cv2.THRESH_BINARY_INV)
         
         # Apply blur to reduce noise
@@ -71,187 +131,169 @@ class EyeTrackerOpenCV:
     
     def get_direction_text(self, relative_x, relative_y):
         """Convert relative position to direction text"""
-        direction_text = []
-        
-        # Vertical direction
-        if relative_y < -0.2:
-            direction_text.append("Up")
-        elif relative_y > 0.2:
-            direction_text.append("Down")
-        
-        # Horizontal direction
-        if relative_x < -0.2:
-            direction_text.append("Left")
-        elif relative_x > 0.2:
-            direction_text.append("Right")
-        
-        if not direction_text:
-            direction_text.append("Center")
-        
-        return " ".join(direction_text)
+        return gaze_direction_text(relative_x, relative_y, 0.2)
     
     def smooth_gaze(self, relative_x, relative_y):
         """Smooth gaze position using moving average"""
-        self.gaze_history.append((relative_x, relative_y))
+        # Overwrite the oldest sample in place instead of append + pop(0)
+        self.gaze_history[self.gaze_index] = (relative_x, relative_y)
+        self.gaze_index = (self.gaze_index + 1) % self.history_size
+        self.gaze_count = min(self.gaze_count + 1, self.history_size)
         
-        if len(self.gaze_history) > self.history_size:
-            self.gaze_history.pop(0)
-        
-        avg_x = np.mean([g[0] for g in self.gaze_history])
-        avg_y = np.mean([g[1] for g in self.gaze_history])
+        avg_x, avg_y = self.gaze_history[:self.gaze_count].mean(axis=0)
         
         return avg_x, avg_y
     
     def draw_gaze_indicator(self, frame, relative_x, relative_y):
         """Draw a gaze direction indicator in the corner"""
-        indicator_size = 150
-        indicator_x = frame.shape[1] - indicator_size - 20
-        indicator_y = 20
-        
-        # Draw indicator background
-        cv2.rectangle(frame, 
-                     (indicator_x, indicator_y), 
-                     (indicator_x + indicator_size, indicator_y + indicator_size),
-                     (50, 50, 50), -1)
-        
-        # Draw center point
-        center_x = indicator_x + indicator_size // 2
-        center_y = indicator_y + indicator_size // 2
-        cv2.circle(frame, (center_x, center_y), 3, (200, 200, 200), -1)
-        
-        # Draw gaze point
-        gaze_x = int(center_x + relative_x * (indicator_size // 2 - 10))
-        gaze_y = int(center_y + relative_y * (indicator_size // 2 - 10))
-        cv2.circle(frame, (gaze_x, gaze_y), 8, (0, 255, 255), -1)
-        
-        # Draw cross-hairs
-        cv2.line(frame, (center_x, indicator_y), (center_x, indicator_y + indicator_size), (100, 100, 100), 1)
-        cv2.line(frame, (indicator_x, center_y), (indicator_x + indicator_size, center_y), (100, 100, 100), 1)
-        
-        # Label
-        cv2.putText(frame, "Gaze Direction", 
-                   (indicator_x, indicator_y - 5), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        self.gaze_indicator.draw(frame, relative_x, relative_y)
     
-    def run(self):
-        """Main loop to run eye tracking"""
-        cap = cv2.VideoCapture(0)
+    def detect_face(self, frame, gray):
+        """Largest face as ((x, y, w, h), eye centers), or None if there is none"""
+        if self.face_detector is None:
+            return self.detect_face_haar(gray)
         
-        if not cap.isOpened():
-            print("Error: Could not open camera")
-            return
+        # Detect faces on a downscaled copy
+        # (rows: x, y, w, h, right eye x/y, left eye x/y, ..., score)
+        small = cv2.resize(frame, None, fx=DETECTION_SCALE, fy=DETECTION_SCALE,
+                           interpolation=cv2.INTER_AREA)
+        small_size = (small.shape[1], small.shape[0])
+        if self.detector_size != small_size:
+            self.detector_size = small_size
+            self.face_detector.setInputSize(small_size)
+        _, faces = self.face_detector.detect(small)
+        if faces is None or len(faces) == 0:
+            return None
         
-        print("Eye Tracker Started! (OpenCV Version)")
-        print("Press 'q' to quit")
-        print("-" * 50)
+        # Boxes and landmarks back to full-frame coordinates (not the score)
+        faces[:, :-1] /= DETECTION_SCALE
+        
+        # Use the largest face
+        face = faces[np.argmax(faces[:, 2] * faces[:, 3])]
+        return tuple(face[:4].astype(int)), face[4:8].reshape(2, 2).astype(int)
+    
+    def detect_face_haar(self, gray):
+        """Haar cascade fallback for detect_face when the YuNet model is unavailable"""
+        # Detect on a downscaled copy, like the YuNet path, and scale back up
+        small = cv2.resize(gray, None, fx=DETECTION_SCALE, fy=DETECTION_SCALE,
+                           interpolation=cv2.INTER_AREA)
+        min_face = int(100 * DETECTION_SCALE)
+        faces = self.face_cascade.detectMultiScale(
+            small, scaleFactor=1.3, minNeighbors=5, minSize=(min_face, min_face)
+        )
+        if len(faces) == 0:
+            return None
+        
+        # Use the largest face; eyes are searched inside it
+        sx, sy, sw, sh = faces[np.argmax(faces[:, 2] * faces[:, 3])]
+        min_eye = int(30 * DETECTION_SCALE)
+        eyes = self.eye_cascade.detectMultiScale(
+            small[sy:sy + sh, sx:sx + sw], scaleFactor=1.1, minNeighbors=10,
+            minSize=(min_eye, min_eye)
+        )
+        
+        # Face box and eye centers back to full-frame coordinates
+        fx, fy, fw, fh = (int(v / DETECTION_SCALE) for v in (sx, sy, sw, sh))
+        eye_centers = [
+            (int((sx + ex + ew / 2) / DETECTION_SCALE), int((sy + ey + eh / 2) / DETECTION_SCALE))
+            for ex, ey, ew, eh in eyes[:2]
+        ]
+        return (fx, fy, fw, fh), eye_centers
+    
+    def process_frame(self, frame):
+        """Run detection on one camera frame and return it annotated"""
+        # Flip frame horizontally for mirror view, in place in the capture buffer
+        cv2.flip(frame, 1, dst=frame)
         
-        while cap.isOpened():
-            success, frame = cap.read()
-            if not success:
-                print("Failed to grab frame")
-                continue
+        # Convert to grayscale for pupil detection
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        
+        frame_height, frame_width = frame.shape[:2]
+        
+        detection = self.detect_face(frame, gray)
+        
+        if detection is not None:
+            (fx, fy, fw, fh), eye_centers = detection
             
-            # Flip frame horizontally for mirror view
-            frame = cv2.flip(frame, 1)
+            # Draw face rectangle
+            cv2.rectangle(frame, (fx, fy), (fx + fw, fy + fh), (255, 255, 0), 2)
             
-            # Convert to grayscale for detection
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            # Square eye regions around the detected eye centers
+            eye_size = max(fw // 4, 10)
             
-            # Detect faces
-            faces = self.face_cascade.detectMultiScale(
-                gray, 
-                scaleFactor=1.3, 
-                minNeighbors=5,
-                minSize=(100, 100)
-            )
+            gaze_positions = []
             
-            frame_height, frame_width = frame.shape[:2]
+            for eye_x, eye_y in eye_centers:
+                ex = max(eye_x - eye_size // 2, 0)
+                ey = max(eye_y - eye_size // 2, 0)
+                
+                # Extract eye region
+                eye_roi = gray[ey:ey + eye_size, ex:ex + eye_size]
+                if eye_roi.size == 0:
+                    continue
+                eh, ew = eye_roi.shape
+                
+                # Draw eye rectangle
+                cv2.rectangle(frame, (ex, ey), (ex + ew, ey + eh), (0, 255, 0), 2)
+                
+                # Detect pupil
+                pupil_pos = self.detect_pupil(eye_roi)
+                
+                # Draw pupil
+                pupil_x = ex + pupil_pos[0]
+                pupil_y = ey + pupil_pos[1]
+                cv2.circle(frame, (pupil_x, pupil_y), 5, (0, 0, 255), -1)
+                
+                # Calculate gaze direction
+                relative_x, relative_y = self.get_gaze_direction(pupil_pos, (ex, ey, ew, eh))
+                gaze_positions.append((relative_x, relative_y))
             
-            if len(faces) > 0:
-                # Use the largest face
-                face = max(faces, key=lambda f: f[2] * f[3])
-                fx, fy, fw, fh = face
+            if gaze_positions:
+                # Average gaze from both eyes
+                avg_x, avg_y = np.mean(gaze_positions, axis=0)
                 
-                # Draw face rectangle
-                cv2.rectangle(frame, (fx, fy), (fx + fw, fy + fh), (255, 255, 0), 2)
+                # Apply smoothing
+                smooth_x, smooth_y = self.smooth_gaze(avg_x, avg_y)
                 
-                # Region of interest for eyes (upper half of face)
-                roi_gray = gray[fy:fy + fh, fx:fx + fw]
-                roi_color = frame[fy:fy + fh, fx:fx + fw]
+                # Get direction text
+                direction = self.get_direction_text(smooth_x, smooth_y)
                 
-                # Detect eyes
-                eyes = self.eye_cascade.detectMultiScale(
-                    roi_gray,
-                    scaleFactor=1.1,
-                    minNeighbors=10,
-                    minSize=(30, 30)
-                )
+                # Draw gaze indicator
+                self.draw_gaze_indicator(frame, smooth_x, smooth_y)
                 
-                gaze_positions = []
+                # Display information
+                gaze_text = f"Looking: {direction}"
+                self.gaze_text.draw(frame, gaze_text, (10, 30))
                 
-                for i, (ex, ey, ew, eh) in enumerate(eyes[:2]):  # Process up to 2 eyes
-                    # Draw eye rectangle
-                    cv2.rectangle(roi_color, (ex, ey), (ex + ew, ey + eh), (0, 255, 0), 2)
-                    
-                    # Extract eye region
-                    eye_roi = roi_gray[ey:ey + eh, ex:ex + ew]
-                    
-                    # Detect pupil
-                    pupil_pos = self.detect_pupil(eye_roi)
-                    
-                    # Draw pupil
-                    pupil_x = fx + ex + pupil_pos[0]
-                    pupil_y = fy + ey + pupil_pos[1]
-                    cv2.circle(frame, (pupil_x, pupil_y), 5, (0, 0, 255), -1)
-                    
-                    # Calculate gaze direction
-                    relative_x, relative_y = self.get_gaze_direction(pupil_pos, (ex, ey, ew, eh))
-                    gaze_positions.append((relative_x, relative_y))
+                coord_text = f"X: {smooth_x:.2f}, Y: {smooth_y:.2f}"
+                self.coord_text.draw(frame, coord_text, (10, 70))
                 
-                if gaze_positions:
-                    # Average gaze from both eyes
-                    avg_x = np.mean([g[0] for g in gaze_positions])
-                    avg_y = np.mean([g[1] for g in gaze_positions])
-                    
-                    # Apply smoothing
-                    smooth_x, smooth_y = self.smooth_gaze(avg_x, avg_y)
-                    
-                    # Get direction text
-                    direction = self.get_direction_text(smooth_x, smooth_y)
-                    
-                    # Draw gaze indicator
-                    self.draw_gaze_indicator(frame, smooth_x, smooth_y)
-                    
-                    # Display information
-                    gaze_text = f"Looking: {direction}"
-                    cv2.putText(frame, gaze_text, (10, 30), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                    
-                    coord_text = f"X: {smooth_x:.2f}, Y: {smooth_y:.2f}"
-                    cv2.putText(frame, coord_text, (10, 70), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                    
-                    # Eye count
-                    eye_count_text = f"Eyes detected: {len(eyes[:2])}"
-                    cv2.putText(frame, eye_count_text, (10, 110), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
-                else:
-                    cv2.putText(frame, "Eyes detected but tracking failed", (10, 30), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
+                # Eye count
+                eye_count_text = f"Eyes detected: {len(gaze_positions)}"
+                self.eye_count_text.draw(frame, eye_count_text, (10, 110))
             else:
-                cv2.putText(frame, "No face detected", (10, 30), 
-                          cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            
-            # Display instructions
-            cv2.putText(frame, "Press 'q' to quit", (10, frame_height - 10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-            
-            # Show the frame
-            cv2.imshow('Eye Tracker (OpenCV)', frame)
-            
-            # Exit on 'q' press
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+                self.tracking_failed_text.draw(frame, (10, 30))
+        else:
+            self.no_face_text.draw(frame, (10, 30))
+        
+        # Display instructions
+        self.quit_text.draw(frame, (10, frame_height - 10))
+        
+        return frame
+    
+    def run(self):
+        """Main loop to run eye tracking"""
+        cap = open_camera(0)
+        
+        if not cap.isOpened():
+            print("Error: Could not open camera")
+            return
+        
+        print("Eye Tracker Started! (OpenCV Version)")
+        print("Press 'q' to quit")
+        print("-" * 50)
+        
+        run_pipeline(cap, self.process_frame, 'Eye Tracker (OpenCV)')
         
         cap.release()
         cv2.destroyAllWindows()
@@ -3,16 +3,50 @@ import mediapipe as mp
 import numpy as np
 import time
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+from landmarkers import (
+    StreamClock, create_hand_landmarker, landmarks_to_array, to_image, to_landmark_list
+)
+from overlays import CachedText, TextStamp
+from pipeline import open_camera, run_pipeline
+
+
+def _count(tips, bases, is_right_hand):
+    """Raised fingers from (5, 2) arrays of tip and base x/y, thumb first"""
+    # Thumb is up if its tip is past the base, towards the thumb side
+    if is_right_hand:
+        count = 1 if tips[0, 0] > bases[0, 0] else 0
+    else:
+        count = 1 if tips[0, 0] < bases[0, 0] else 0
+    
+    # Other fingers are up if the tip is above the base (lower y value)
+    for i in range(1, 5):
+        if tips[i, 1] < bases[i, 1]:
+            count += 1
+    return count
+
+
+if NUMBA_AVAILABLE:
+    _count = numba.njit(cache=True)(_count)
+
+
 class FingerDetector:
     def __init__(self):
-        # Initialize MediaPipe Hands
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.7,
+        # Initialize MediaPipe Hand Landmarker (Tasks API, GPU delegate when available)
+        self.hands = create_hand_landmarker(
+            self.on_hand_result,
+            num_hands=2,
+            min_hand_detection_confidence=0.7,
+            min_hand_presence_confidence=0.7,
             min_tracking_confidence=0.7
         )
+        self.clock = StreamClock()
+        self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
@@ -20,9 +54,15 @@ class FingerDetector:
         self.finger_tips = [4, 8, 12, 16, 20]  # Thumb, Index, Middle, Ring, Pinky
         self.finger_bases = [2, 6, 10, 14, 18]
         
+        # Fingertip indicator colors per raised-finger count: green up, red down
+        self.tip_colors = [
+            [(0, 255, 0)] * count + [(0, 0, 255)] * (5 - count) for count in range(6)
+        ]
+        
         # Action cooldown to prevent rapid triggering
         self.last_action_time = 0
         self.action_cooldown = 1.0  # seconds
+        self.last_action = None
         
         # Background color for visual feedback
         self.bg_color = (50, 50, 50)
@@ -35,35 +75,40 @@ class FingerDetector:
             5: (255, 100, 255),   # 5 fingers - Magenta
         }
         
-    def count_fingers(self, hand_landmarks, handedness):
-        """Count the number of raised fingers"""
-        if not hand_landmarks:
-            return 0
+        # Reused solid strip for the info panel background
+        self.overlay_strip = None
         
-        fingers_up = []
+        # RGB copy of the current frame, reused across frames
+        self.rgb_buffer = None
         
-        # Check if it's left or right hand
-        is_right_hand = handedness == "Right"
+        # Hand inference is skipped while the mean thumbnail difference stays below this
+        self.motion_threshold = 2.0
+        # ...but runs at least this often, since a single finger moving barely
+        # changes the mean difference of the whole thumbnail
+        self.max_skip_s = 0.2
+        self.inferred_small = None
+        self.inferred_time = 0.0
+        self.last_results = None
         
-        # Thumb (special case - check horizontal position)
-        thumb_tip = hand_landmarks.landmark[self.finger_tips[0]]
-        thumb_base = hand_landmarks.landmark[self.finger_bases[0]]
+        # Instructions text, rendered once
+        self.quit_text = TextStamp("Press 'q' to quit", 0.5, (200, 200, 200))
         
-        if is_right_hand:
-            # Right hand: thumb is up if tip is to the right of base
-            fingers_up.append(thumb_tip.x > thumb_base.x)
-        else:
-            # Left hand: thumb is up if tip is to the left of base
-            fingers_up.append(thumb_tip.x < thumb_base.x)
+        # Per-frame text styles; repeated strings reuse their rendered stamps
+        self.finger_text = CachedText(2, (255, 255, 255), 3, cv2.FONT_HERSHEY_DUPLEX)
+        self.action_text = CachedText(0.7, (255, 255, 255), 2)
+        self.hand_text = CachedText(0.8, (255, 255, 255), 2)
+        self.hand_label_text = CachedText(0.6, (255, 255, 0), 2)
         
-        # Other four fingers (check vertical position)
-        for i in range(1, 5):
-            tip = hand_landmarks.landmark[self.finger_tips[i]]
-            base = hand_landmarks.landmark[self.finger_bases[i]]
-            # Finger is up if tip is above base (lower y value)
-            fingers_up.append(tip.y < base.y)
+    def on_hand_result(self, result, image, timestamp_ms):
+        """Hand landmarker callback; runs on a MediaPipe thread"""
+        self.last_results = result
+    
+    def count_fingers(self, points, handedness):
+        """Count the number of raised fingers from the hand's (21, 2) landmark array"""
+        if len(points) == 0:
+            return 0
         
-        return sum(fingers_up)
+        return int(_count(points[self.finger_tips], points[self.finger_bases], handedness == "Right"))
     
     def perform_action(self, finger_count):
         """Perform action based on finger count"""
@@ -94,52 +139,117 @@ class FingerDetector:
         """Draw information panel on the frame"""
         h, w = frame.shape[:2]
         
-        # Create semi-transparent overlay
-        overlay = frame.copy()
-        
-        # Draw colored background based on finger count
-        cv2.rectangle(overlay, (0, 0), (w, 120), self.bg_color, -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        # Semi-transparent colored background based on finger count. Only the
+        # top band changes, so blend a solid strip into those rows in place
+        band = frame[:120]
+        if self.overlay_strip is None or self.overlay_strip.shape != band.shape:
+            self.overlay_strip = np.empty_like(band)
+        self.overlay_strip[:] = self.bg_color
+        cv2.addWeighted(self.overlay_strip, 0.7, band, 0.3, 0, dst=band)
         
         # Display finger count (large)
         finger_text = f"Fingers: {finger_count}"
-        cv2.putText(frame, finger_text, (20, 60), 
-                   cv2.FONT_HERSHEY_DUPLEX, 2, (255, 255, 255), 3)
+        self.finger_text.draw(frame, finger_text, (20, 60))
         
         # Display action
         if action_text:
-            cv2.putText(frame, action_text, (20, 100), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            self.action_text.draw(frame, action_text, (20, 100))
         
         # Display hand count
         hand_text = f"Hands: {hand_count}"
-        cv2.putText(frame, hand_text, (w - 180, 40), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        self.hand_text.draw(frame, hand_text, (w - 180, 40))
     
-    def draw_finger_indicators(self, frame, hand_landmarks, finger_count):
+    def draw_finger_indicators(self, frame, points, finger_count):
         """Draw visual indicators for each finger"""
-        if not hand_landmarks:
+        if len(points) == 0:
             return
         
-        h, w = frame.shape[:2]
+        # Draw circles at fingertips; the first finger_count tips count as up
+        tips = points[self.finger_tips].astype(int).tolist()
+        for (x, y), color in zip(tips, self.tip_colors[finger_count]):
+            cv2.circle(frame, (x, y), 15, color, -1)
+            cv2.circle(frame, (x, y), 15, (255, 255, 255), 2)
+    
+    def process_frame(self, frame):
+        """Run detection on one camera frame and return it annotated"""
+        # Flip frame horizontally for mirror view, in place in the capture buffer
+        cv2.flip(frame, 1, dst=frame)
+        
+        # Motion gate: compare an 80x60 thumbnail with the one from the last
+        # inference, and reuse that inference's results while the scene is static
+        small = cv2.cvtColor(
+            cv2.resize(frame, (80, 60), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY
+        )
+        now = time.monotonic()
+        if (self.last_results is None
+                or now - self.inferred_time >= self.max_skip_s
+                or cv2.absdiff(small, self.inferred_small).mean() >= self.motion_threshold):
+            # Convert to RGB for MediaPipe, reusing one buffer across frames
+            if self.rgb_buffer is None or self.rgb_buffer.shape != frame.shape:
+                self.rgb_buffer = np.empty_like(frame)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.rgb_buffer)
+            
+            # Process the frame; mp.Image copies the pixels, so the buffer can be
+            # overwritten by the next frame while this one is still being inferred
+            self.hands.detect_async(to_image(self.rgb_buffer), self.clock())
+            self.inferred_small = small
+            self.inferred_time = now
         
-        # Draw circles at fingertips
-        colors = [(0, 255, 0), (0, 200, 0), (0, 150, 0), (0, 100, 0), (0, 50, 0)]
+        # Draw whichever result arrived most recently
+        results = self.last_results
         
-        for i, tip_id in enumerate(self.finger_tips):
-            landmark = hand_landmarks.landmark[tip_id]
-            x, y = int(landmark.x * w), int(landmark.y * h)
+        frame_height, frame_width = frame.shape[:2]
+        total_fingers = 0
+        hand_count = 0
+        
+        if results and results.hand_landmarks and results.handedness:
+            hand_count = len(results.hand_landmarks)
             
-            # Determine if finger is up
-            is_up = i < finger_count
-            color = (0, 255, 0) if is_up else (0, 0, 255)
+            for hand_landmarks, handedness in zip(results.hand_landmarks, results.handedness):
+                # Draw hand landmarks
+                self.mp_drawing.draw_landmarks(
+                    frame,
+                    to_landmark_list(hand_landmarks),
+                    self.mp_hands.HAND_CONNECTIONS,
+                    self.mp_drawing_styles.get_default_hand_landmarks_style(),
+                    self.mp_drawing_styles.get_default_hand_connections_style()
+                )
+                
+                # All 21 landmarks in pixels, gathered once for the steps below
+                points = landmarks_to_array(hand_landmarks, frame_width, frame_height)
+                
+                # Count fingers
+                hand_type = handedness[0].category_name
+                finger_count = self.count_fingers(points, hand_type)
+                total_fingers += finger_count
+                
+                # Draw finger indicators
+                self.draw_finger_indicators(frame, points, finger_count)
+                
+                # Display hand type
+                wrist_x, wrist_y = points[0].astype(int).tolist()
+                self.hand_label_text.draw(frame, f"{hand_type} ({finger_count})",
+                                          (wrist_x - 50, wrist_y - 20))
             
-            cv2.circle(frame, (x, y), 15, color, -1)
-            cv2.circle(frame, (x, y), 15, (255, 255, 255), 2)
+            # Perform action based on total finger count
+            action = self.perform_action(total_fingers)
+            if action:
+                self.last_action = action
+        else:
+            # Reset background when no hands detected
+            self.bg_color = (50, 50, 50)
+        
+        # Draw info panel
+        self.draw_info_panel(frame, total_fingers, self.last_action, hand_count)
+        
+        # Display instructions
+        self.quit_text.draw(frame, (10, frame_height - 10))
+        
+        return frame
     
     def run(self):
         """Main loop to run finger detection"""
-        cap = cv2.VideoCapture(0)
+        cap = open_camera(0)
         
         if not cap.isOpened():
             print("Error: Could not open camera")
@@ -158,76 +268,7 @@ class FingerDetector:
         print("  5 fingers - Previous Track")
         print("-" * 50)
         
-        last_action = None
-        
-        while cap.isOpened():
-            success, frame = cap.read()
-            if not success:
-                print("Failed to grab frame")
-                continue
-            
-            # Flip frame horizontally for mirror view
-            frame = cv2.flip(frame, 1)
-            
-            # Convert to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Process the frame
-            results = self.hands.process(rgb_frame)
-            
-            frame_height, frame_width = frame.shape[:2]
-            total_fingers = 0
-            hand_count = 0
-            
-            if results.multi_hand_landmarks and results.multi_handedness:
-                hand_count = len(results.multi_hand_landmarks)
-                
-                for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
-                    # Draw hand landmarks
-                    self.mp_drawing.draw_landmarks(
-                        frame,
-                        hand_landmarks,
-                        self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                        self.mp_drawing_styles.get_default_hand_connections_style()
-                    )
-                    
-                    # Count fingers
-                    hand_type = handedness.classification[0].label
-                    finger_count = self.count_fingers(hand_landmarks, hand_type)
-                    total_fingers += finger_count
-                    
-                    # Draw finger indicators
-                    self.draw_finger_indicators(frame, hand_landmarks, finger_count)
-                    
-                    # Display hand type
-                    wrist = hand_landmarks.landmark[0]
-                    wrist_x, wrist_y = int(wrist.x * frame_width), int(wrist.y * frame_height)
-                    cv2.putText(frame, f"{hand_type} ({finger_count})", 
-                               (wrist_x - 50, wrist_y - 20),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                
-                # Perform action based on total finger count
-                action = self.perform_action(total_fingers)
-                if action:
-                    last_action = action
-            else:
-                # Reset background when no hands detected
-                self.bg_color = (50, 50, 50)
-            
-            # Draw info panel
-            self.draw_info_panel(frame, total_fingers, last_action, hand_count)
-            
-            # Display instructions
-            cv2.putText(frame, "Press 'q' to quit", (10, frame_height - 10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-            
-            # Show the frame
-            cv2.imshow('Finger Detector', frame)
-            
-            # Exit on 'q' press
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+        run_pipeline(cap, self.process_frame, 'Finger Detector')
         
         cap.release()
         cv2.destroyAllWindows()
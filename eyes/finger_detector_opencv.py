@@ -1,14 +1,193 @@
+import sys
 import cv2
 import numpy as np
 import time
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+from overlays import CachedText, Text, TextStamp
+from pipeline import open_camera, run_pipeline
+
+# Skin detection and contour search run on the ROI downscaled by this factor
+# (150x150); the per-pixel stages touch 4x fewer pixels
+DETECTION_SCALE = 0.5
+
+# Capture mode; the hand ROI (x 350-650) needs frames wider than 640 px
+CAPTURE_WIDTH = 1280
+CAPTURE_HEIGHT = 720
+
+# Initial size of the main window; WINDOW_NORMAL scales the frame to fit
+DISPLAY_WIDTH = 640
+DISPLAY_HEIGHT = 360
+
+# Smallest contour area (full ROI pixels) treated as a hand
+MIN_HAND_AREA = 3000
+
+# Smallest defect depth counted as a finger gap: 30 px in OpenCV's 8.8
+# fixed point, so the raw integer depths are compared directly
+MIN_GAP_DEPTH = 30 * 256
+
+# Skin color ranges; a pixel is skin if it falls in either
+SKIN_HSV_RANGE = ((0, 15, 0), (25, 255, 255))
+SKIN_YCRCB_RANGE = ((0, 133, 77), (255, 173, 127))
+
+# Bits per channel of the skin lookup table (32 levels, 32k entries)
+SKIN_LUT_BITS = 5
+
+
+def _build_skin_lut():
+    """
+    Skin mask value (0 or 255) for every quantized BGR color, indexed by
+    (b << 2*bits) | (g << bits) | r. Classifying a pixel is then one lookup
+    instead of two color conversions and two range checks.
+    """
+    levels = 1 << SKIN_LUT_BITS
+    shift = 8 - SKIN_LUT_BITS
+    b, g, r = np.meshgrid(*[np.arange(levels, dtype=np.uint16)] * 3, indexing='ij')
+    # Classify the center of each quantization bin, all colors as one image row
+    colors = (np.stack([b, g, r], axis=-1) << shift) + (1 << shift >> 1)
+    colors = colors.astype(np.uint8).reshape(1, -1, 3)
+    
+    hsv = cv2.cvtColor(colors, cv2.COLOR_BGR2HSV)
+    ycrcb = cv2.cvtColor(colors, cv2.COLOR_BGR2YCrCb)
+    mask_hsv = cv2.inRange(hsv, *[np.array(x, np.uint8) for x in SKIN_HSV_RANGE])
+    mask_ycrcb = cv2.inRange(ycrcb, *[np.array(x, np.uint8) for x in SKIN_YCRCB_RANGE])
+    return cv2.bitwise_or(mask_hsv, mask_ycrcb).ravel()
+
+
+def _finger_gaps(contour, defects):
+    """
+    Far points (N, 2) of all convexity defects, and whether each one's
+    start-far-end angle is at most 90 degrees (a gap between two fingers).
+    Computed for every defect at once instead of one at a time.
+    """
+    points = contour[:, 0, :]
+    d = defects[:, 0, :]
+    start, end, far = points[d[:, 0]], points[d[:, 1]], points[d[:, 2]]
+    
+    # Squared lengths of all sides of the triangles
+    a2 = ((end - start) ** 2).sum(axis=1)
+    b2 = ((far - start) ** 2).sum(axis=1)
+    c2 = ((end - far) ** 2).sum(axis=1)
+    
+    # The angle at far is at most 90 degrees exactly when its cosine
+    # (b² + c² - a²) / 2bc is non-negative, so no sqrt or arccos is needed.
+    # Degenerate triangles (b or c zero) never count
+    return far, (b2 > 0) & (c2 > 0) & (b2 + c2 >= a2)
+
+
+def _finger_gaps_loop(contour, defects):
+    """Same as _finger_gaps, one defect at a time; compiled with numba"""
+    # (N, 2) views, taken once instead of indexing the cv2 layouts per defect
+    points = contour[:, 0, :]
+    d = defects[:, 0, :]
+    n = d.shape[0]
+    far = np.empty((n, 2), contour.dtype)
+    acute = np.zeros(n, np.bool_)
+    for i in range(n):
+        s, e, f = d[i, 0], d[i, 1], d[i, 2]
+        sx, sy = points[s, 0], points[s, 1]
+        ex, ey = points[e, 0], points[e, 1]
+        fx, fy = points[f, 0], points[f, 1]
+        far[i, 0] = fx
+        far[i, 1] = fy
+        
+        a2 = (ex - sx) * (ex - sx) + (ey - sy) * (ey - sy)
+        b2 = (fx - sx) * (fx - sx) + (fy - sy) * (fy - sy)
+        c2 = (ex - fx) * (ex - fx) + (ey - fy) * (ey - fy)
+        acute[i] = b2 > 0 and c2 > 0 and b2 + c2 >= a2
+    return far, acute
+
+
+# Division tables of OpenCV's 8-bit BGR2HSV (12-bit fixed point): 255/v for
+# saturation and 180/(6*diff) for hue
+_HSV_SHIFT = 12
+_SDIV_TABLE = np.array([0] + [round((255 << _HSV_SHIFT) / i) for i in range(1, 256)], np.int64)
+_HDIV_TABLE = np.array([0] + [round((180 << _HSV_SHIFT) / (6 * i)) for i in range(1, 256)], np.int64)
+
+# OpenCV's 8-bit BGR2YCrCb coefficients (14-bit fixed point)
+_YUV_SHIFT = 14
+_R2Y, _G2Y, _B2Y, _R2CR, _B2CB = 4899, 9617, 1868, 11682, 9241
+
+
+def _skin_mask_loop(bgr, out):
+    """
+    Skin mask (0 or 255) of a BGR image into out: HSV and YCrCb are computed
+    per pixel with the integer formulas of OpenCV's 8-bit cvtColor, so the
+    mask matches cvtColor + inRange, without materializing either converted
+    image. Compiled with numba; without it the lookup table is used instead.
+    """
+    (h_lo, s_lo, v_lo), (h_hi, s_hi, v_hi) = SKIN_HSV_RANGE
+    (y_lo, cr_lo, cb_lo), (y_hi, cr_hi, cb_hi) = SKIN_YCRCB_RANGE
+    yuv_round = 1 << (_YUV_SHIFT - 1)
+    yuv_delta = 128 << _YUV_SHIFT
+    hsv_round = 1 << (_HSV_SHIFT - 1)
+    rows, cols = out.shape
+    for i in range(rows):
+        for j in range(cols):
+            # Signed ints: numba turns mixed uint/int arithmetic into floats
+            b = np.int64(bgr[i, j, 0])
+            g = np.int64(bgr[i, j, 1])
+            r = np.int64(bgr[i, j, 2])
+            
+            # YCrCb
+            y = (r * _R2Y + g * _G2Y + b * _B2Y + yuv_round) >> _YUV_SHIFT
+            cr = min(max(((r - y) * _R2CR + yuv_delta + yuv_round) >> _YUV_SHIFT, 0), 255)
+            cb = min(max(((b - y) * _B2CB + yuv_delta + yuv_round) >> _YUV_SHIFT, 0), 255)
+            skin = (y_lo <= y <= y_hi and cr_lo <= cr <= cr_hi
+                    and cb_lo <= cb <= cb_hi)
+            
+            if not skin:
+                # HSV, with hue in [0, 180) as for 8-bit images
+                v = max(r, g, b)
+                diff = v - min(r, g, b)
+                s = (diff * _SDIV_TABLE[v] + hsv_round) >> _HSV_SHIFT
+                if v == r:
+                    hue = g - b
+                elif v == g:
+                    hue = b - r + 2 * diff
+                else:
+                    hue = r - g + 4 * diff
+                hue = (hue * _HDIV_TABLE[diff] + hsv_round) >> _HSV_SHIFT
+                if hue < 0:
+                    hue += 180
+                skin = (h_lo <= hue <= h_hi and s_lo <= s <= s_hi
+                        and v_lo <= v <= v_hi)
+            
+            out[i, j] = 255 if skin else 0
+
+
+if NUMBA_AVAILABLE:
+    # A plain loop beats numpy's per-call dispatch for a handful of defects
+    _finger_gaps = numba.njit(cache=True)(_finger_gaps_loop)
+    # One fused pass over the ROI instead of two conversions and two range checks
+    _skin_mask = numba.njit(cache=True)(_skin_mask_loop)
+
+
 class FingerDetectorOpenCV:
-    def __init__(self):
+    # Action for each finger count
+    ACTIONS = {
+        0: "✊ Fist - No action",
+        1: "☝️ One - Play/Pause",
+        2: "✌️ Two - Volume Up",
+        3: "🤟 Three - Volume Down",
+        4: "🖖 Four - Next Track",
+        5: "🖐️ Five - Previous Track"
+    }
+    
+    def __init__(self, debug=False):
+        # Debug mode also shows the skin mask in its own window and the hand center
+        self.debug = debug
+        
         # For background subtraction and skin detection
         self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
         
         # Action cooldown to prevent rapid triggering
-        self.last_action_time = 0
+        self.next_action_time = 0
         self.action_cooldown = 1.0  # seconds
         
         # Background color for visual feedback
@@ -28,38 +207,106 @@ class FingerDetectorOpenCV:
         self.roi_left = 350
         self.roi_right = 650
         
+        # Background subtractor warm-up before detection starts
+        self.calibration_frames = 30
+        self.frame_count = 0
+        
+        self.last_action = None
+        
+        # Finger counting is skipped while the mean skin-mask thumbnail
+        # difference stays below this
+        self.mask_threshold = 2.0
+        self.counted_small = None
+        self.last_hand = None
+        
+        # Fixed messages, rendered once
+        self.calibrate_hint_text = TextStamp("Keep hand OUT of green box", 0.6, (0, 0, 255), 2)
+        self.too_small_text = TextStamp("Area too small - move hand closer", 0.5, (0, 165, 255), 2)
+        self.no_skin_text = TextStamp("No skin detected - check lighting", 0.5, (0, 0, 255), 2)
+        self.instructions_text = TextStamp(
+            "Press 'q' to quit | Place hand in green box", 0.5, (200, 200, 200)
+        )
+        
+        # Countdown and contour area change every frame, so they go straight
+        # to putText; the finger count and action labels repeat and are stamped
+        self.calibrating_text = Text(0.7, (0, 255, 0), 2)
+        self.area_text = Text(0.6, (255, 255, 0), 2)
+        self.finger_text = CachedText(2, (255, 255, 255), 3, cv2.FONT_HERSHEY_DUPLEX)
+        self.action_text = CachedText(0.7, (255, 255, 255), 2)
+        
+        # Info panel backgrounds keyed by color (see draw_info_panel)
+        self.panel_shape = None
+        self.panel_strips = {}
+        
+        # Without numba, skin is classified by a table over all quantized BGR colors
+        self.skin_lut = None if NUMBA_AVAILABLE else _build_skin_lut()
+        
+        # detect_skin works in buffers reused across frames, sized on first use
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        self.skin_shape = None
+        
+        # Run the mask clean-up on OpenCL (integrated GPU) where available
+        self.use_opencl = cv2.ocl.haveOpenCL()
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+        
+        if NUMBA_AVAILABLE:
+            # Compile now rather than on the first frame with a hand
+            _finger_gaps(np.zeros((3, 1, 2), np.int32), np.zeros((1, 1, 4), np.int32))
+            _skin_mask(np.zeros((1, 1, 3), np.uint8), np.zeros((1, 1), np.uint8))
+        
     def detect_skin(self, frame):
         """Detect skin color in the frame"""
-        # Convert to HSV and YCrCb color spaces for better skin detection
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        ycrcb = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb)
-        
-        # HSV skin color range (wider range for better detection)
-        lower_hsv = np.array([0, 15, 0], dtype=np.uint8)
-        upper_hsv = np.array([25, 255, 255], dtype=np.uint8)
-        mask_hsv = cv2.inRange(hsv, lower_hsv, upper_hsv)
+        h, w = frame.shape[:2]
+        if self.skin_shape != (h, w):
+            self.skin_shape = (h, w)
+            self.skin_quantized = np.empty((h, w, 3), np.uint8)
+            self.skin_index = np.empty((h, w), np.uint16)
+            self.skin_channel = np.empty((h, w), np.uint16)
+            self.skin_mask = np.empty((h, w), np.uint8)
+            self.skin_opened = np.empty((h, w), np.uint8)
         
-        # YCrCb skin color range (works better in some lighting)
-        lower_ycrcb = np.array([0, 133, 77], dtype=np.uint8)
-        upper_ycrcb = np.array([255, 173, 127], dtype=np.uint8)
-        mask_ycrcb = cv2.inRange(ycrcb, lower_ycrcb, upper_ycrcb)
+        if NUMBA_AVAILABLE:
+            # HSV or YCrCb skin ranges, evaluated per pixel in one compiled pass
+            _skin_mask(frame, self.skin_mask)
+        else:
+            q = self.skin_quantized
+            idx = self.skin_index
+            
+            # HSV or YCrCb skin ranges, looked up per quantized BGR color in one pass
+            np.right_shift(frame, 8 - SKIN_LUT_BITS, out=q)
+            np.copyto(idx, q[..., 0])
+            idx <<= 2 * SKIN_LUT_BITS
+            np.copyto(self.skin_channel, q[..., 1])
+            self.skin_channel <<= SKIN_LUT_BITS
+            idx |= self.skin_channel
+            idx |= q[..., 2]
+            # Indices are always in range; 'clip' lets take write out= unbuffered
+            np.take(self.skin_lut, idx, out=self.skin_mask, mode='clip')
         
-        # Combine both masks
-        mask = cv2.bitwise_or(mask_hsv, mask_ycrcb)
+        if self.use_opencl:
+            # Same clean-up through the T-API, on the GPU; get() hands back a
+            # fresh array for findContours and the display
+            mask = cv2.UMat(self.skin_mask)
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel, iterations=2)
+            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel, iterations=2)
+            return cv2.GaussianBlur(mask, (5, 5), 0).get()
         
         # Apply morphological operations to clean up the mask
-        kernel = np.ones((3, 3), np.uint8)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=2)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=2)
-        mask = cv2.GaussianBlur(mask, (5, 5), 0)
+        cv2.morphologyEx(self.skin_mask, cv2.MORPH_OPEN, self.kernel,
+                         dst=self.skin_opened, iterations=2)
+        cv2.morphologyEx(self.skin_opened, cv2.MORPH_CLOSE, self.kernel,
+                         dst=self.skin_mask, iterations=2)
         
-        return mask
+        # Fresh array: the result is shown from another thread while the
+        # buffers above are already reused for the next frame
+        return cv2.GaussianBlur(self.skin_mask, (5, 5), 0)
     
     def count_fingers_convexity(self, contour):
         """Count fingers using convexity defects method"""
         try:
-            # Get convex hull
-            hull = cv2.convexHull(contour, returnPoints=False)
+            # Get convex hull, in the monotonic order convexityDefects expects
+            hull = np.sort(cv2.convexHull(contour, returnPoints=False), axis=0)
             
             if len(hull) < 3:
                 return 0
@@ -70,25 +317,9 @@ class FingerDetectorOpenCV:
             if defects is None:
                 return 0
             
-            finger_count = 0
-            
-            for i in range(defects.shape[0]):
-                s, e, f, d = defects[i, 0]
-                start = tuple(contour[s][0])
-                end = tuple(contour[e][0])
-                far = tuple(contour[f][0])
-                
-                # Calculate the length of all sides of the triangle
-                a = np.sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2)
-                b = np.sqrt((far[0] - start[0])**2 + (far[1] - start[1])**2)
-                c = np.sqrt((end[0] - far[0])**2 + (end[1] - far[1])**2)
-                
-                # Calculate the angle
-                angle = np.arccos((b**2 + c**2 - a**2) / (2 * b * c))
-                
-                # If angle is less than 90 degrees, it's a finger gap
-                if angle <= np.pi / 2:
-                    finger_count += 1
+            # If angle is less than 90 degrees, it's a finger gap
+            _, gaps = _finger_gaps(contour, defects)
+            finger_count = int(gaps.sum())
             
             # Number of fingers is defects + 1
             return min(finger_count + 1, 5)
@@ -98,97 +329,69 @@ class FingerDetectorOpenCV:
     
     def count_fingers_contour(self, contour, drawing):
         """Count fingers using contour analysis"""
+        finger_count, hull, center, gap_points = self.analyze_contour(contour)
+        self.draw_hand_markers(drawing, hull, center, gap_points)
+        return finger_count, drawing
+    
+    def analyze_contour(self, contour):
+        """Finger count of a hand contour, plus its hull, center and finger gaps to draw"""
+        hull = center = None
+        gap_points = []
         try:
-            # Get convex hull points
-            hull = cv2.convexHull(contour, returnPoints=True)
-            
-            # Draw convex hull
-            cv2.drawContours(drawing, [hull], -1, (0, 255, 0), 2)
-            
-            # Find convexity defects
-            hull_indices = cv2.convexHull(contour, returnPoints=False)
+            # One hull pass: indices for the defects, points gathered from them
+            # for drawing. convexityDefects needs the indices monotonic, and in
+            # contour order they still trace the hull
+            hull_indices = np.sort(cv2.convexHull(contour, returnPoints=False), axis=0)
+            hull = contour[hull_indices[:, 0]]
             
             if len(hull_indices) < 3:
-                return 0, drawing
+                return 0, hull, center, gap_points
             
+            # Find convexity defects
             defects = cv2.convexityDefects(contour, hull_indices)
             
             if defects is None:
-                return 0, drawing
+                return 0, hull, center, gap_points
             
-            # Count fingers based on defects
-            finger_count = 0
+            # The center is only drawn in debug mode; the mean of the contour
+            # points is close enough for that and far cheaper than moments
+            if self.debug:
+                center = tuple(contour[:, 0, :].mean(axis=0).astype(int).tolist())
             
-            # Get the center of the contour
-            M = cv2.moments(contour)
-            if M["m00"] != 0:
-                cx = int(M["m10"] / M["m00"])
-                cy = int(M["m01"] / M["m00"])
-                cv2.circle(drawing, (cx, cy), 10, (255, 0, 0), -1)
-            else:
-                return 0, drawing
+            # Count fingers based on defects
+            far, acute = _finger_gaps(contour, defects)
             
-            for i in range(defects.shape[0]):
-                s, e, f, d = defects[i, 0]
-                start = tuple(contour[s][0])
-                end = tuple(contour[e][0])
-                far = tuple(contour[f][0])
-                
-                # Distance from defect point to contour
-                distance = d / 256.0
-                
-                # Calculate the length of all sides of the triangle
-                a = np.sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2)
-                b = np.sqrt((far[0] - start[0])**2 + (far[1] - start[1])**2)
-                c = np.sqrt((end[0] - far[0])**2 + (end[1] - far[1])**2)
-                
-                # Semi-perimeter
-                s_p = (a + b + c) / 2
-                
-                # Calculate area using Heron's formula
-                if s_p * (s_p - a) * (s_p - b) * (s_p - c) >= 0:
-                    area = np.sqrt(s_p * (s_p - a) * (s_p - b) * (s_p - c))
-                else:
-                    continue
-                
-                # Calculate angle
-                if b * c == 0:
-                    continue
-                    
-                angle = np.arccos((b**2 + c**2 - a**2) / (2 * b * c))
-                
-                # Filter based on angle and distance
-                if angle <= np.pi / 2 and distance > 30:
-                    finger_count += 1
-                    cv2.circle(drawing, far, 8, (0, 0, 255), -1)
+            # Filter based on angle and distance from the defect point to the hull
+            gaps = acute & (defects[:, 0, 3] > MIN_GAP_DEPTH)
+            gap_points = far[gaps].tolist()
             
             # Number of fingers is typically defects + 1
-            finger_count = min(finger_count + 1, 5)
+            finger_count = min(len(gap_points) + 1, 5)
             
-            return finger_count, drawing
+            return finger_count, hull, center, gap_points
             
         except Exception as e:
-            return 0, drawing
+            return 0, hull, center, gap_points
+    
+    def draw_hand_markers(self, drawing, hull, center, gap_points):
+        """Draw the convex hull, contour center and finger gaps from analyze_contour"""
+        if hull is not None:
+            cv2.drawContours(drawing, [hull], -1, (0, 255, 0), 2)
+        if center is not None:
+            cv2.circle(drawing, center, 10, (255, 0, 0), -1)
+        for x, y in gap_points:
+            cv2.circle(drawing, (x, y), 8, (0, 0, 255), -1)
     
     def perform_action(self, finger_count):
         """Perform action based on finger count"""
         current_time = time.time()
         
         # Check cooldown
-        if current_time - self.last_action_time < self.action_cooldown:
+        if current_time < self.next_action_time:
             return None
         
-        actions = {
-            0: "✊ Fist - No action",
-            1: "☝️ One - Play/Pause",
-            2: "✌️ Two - Volume Up",
-            3: "🤟 Three - Volume Down",
-            4: "🖖 Four - Next Track",
-            5: "🖐️ Five - Previous Track"
-        }
-        
-        action = actions.get(finger_count, "Unknown gesture")
-        self.last_action_time = current_time
+        action = self.ACTIONS.get(finger_count, "Unknown gesture")
+        self.next_action_time = current_time + self.action_cooldown
         
         # Update background color
         self.bg_color = self.action_colors.get(finger_count, (50, 50, 50))
@@ -197,28 +400,139 @@ class FingerDetectorOpenCV:
     
     def draw_info_panel(self, frame, finger_count, action_text):
         """Draw information panel on the frame"""
-        h, w = frame.shape[:2]
-        
-        # Create semi-transparent overlay
-        overlay = frame.copy()
-        
-        # Draw colored background based on finger count
-        cv2.rectangle(overlay, (0, 0), (w, 120), self.bg_color, -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        # Semi-transparent colored background based on finger count, blended
+        # into the top band only. One solid strip per color, built on first use
+        band = frame[:120]
+        if self.panel_shape != band.shape:
+            self.panel_shape = band.shape
+            self.panel_strips = {}
+        strip = self.panel_strips.get(self.bg_color)
+        if strip is None:
+            strip = np.empty(band.shape, np.uint8)
+            strip[:] = self.bg_color
+            self.panel_strips[self.bg_color] = strip
+        cv2.addWeighted(strip, 0.7, band, 0.3, 0, dst=band)
         
         # Display finger count (large)
         finger_text = f"Fingers: {finger_count}"
-        cv2.putText(frame, finger_text, (20, 60), 
-                   cv2.FONT_HERSHEY_DUPLEX, 2, (255, 255, 255), 3)
+        self.finger_text.draw(frame, finger_text, (20, 60))
         
         # Display action
         if action_text:
-            cv2.putText(frame, action_text, (20, 100), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            self.action_text.draw(frame, action_text, (20, 100))
+    
+    def segment_hand(self, frame):
+        """Pipeline stage: mirror the frame, then find the hand contour in the ROI"""
+        # Flip frame horizontally for mirror view
+        cv2.flip(frame, 1, dst=frame)
+        
+        # Draw ROI rectangle
+        cv2.rectangle(frame, (self.roi_left, self.roi_top), 
+                     (self.roi_right, self.roi_bottom), (0, 255, 0), 2)
+        
+        # Extract ROI
+        roi = frame[self.roi_top:self.roi_bottom, self.roi_left:self.roi_right]
+        
+        # Calibration phase
+        if self.frame_count < self.calibration_frames:
+            self.calibrating_text.draw(
+                frame, f"Calibrating... {self.calibration_frames - self.frame_count}",
+                (self.roi_left, self.roi_top - 10)
+            )
+            self.calibrate_hint_text.draw(frame, (self.roi_left, self.roi_top - 40))
+            
+            # Feed background subtractor
+            _ = self.bg_subtractor.apply(roi, learningRate=0.5)
+            self.frame_count += 1
+            
+            return frame, roi, None, None
+        
+        # Detect skin in a downscaled copy of the ROI
+        roi_small = cv2.resize(roi, None, fx=DETECTION_SCALE, fy=DETECTION_SCALE,
+                               interpolation=cv2.INTER_AREA)
+        skin_mask = self.detect_skin(roi_small)
+        
+        # Find contours
+        contours, _ = cv2.findContours(skin_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        # Get the largest contour (assumed to be the hand)
+        max_contour = None
+        if contours:
+            # A contour's area never exceeds its bounding box, so only contours
+            # with a hand-sized box need the exact polygon area
+            boxes = [w * h for _, _, w, h in map(cv2.boundingRect, contours)]
+            min_box = MIN_HAND_AREA * DETECTION_SCALE ** 2
+            candidates = [c for c, box in zip(contours, boxes) if box > min_box]
+            if candidates:
+                max_contour = max(candidates, key=cv2.contourArea)
+            else:
+                # No hand; the largest blob is kept for the "too small" hint
+                max_contour = contours[int(np.argmax(boxes))]
+            # Back to full ROI coordinates, so areas and defect depths keep their scale
+            max_contour = (max_contour / DETECTION_SCALE).astype(np.int32)
+        
+        return frame, roi, skin_mask, max_contour
+    
+    def annotate_hand(self, segmented):
+        """Pipeline stage: count fingers on the hand contour and draw the overlays"""
+        frame, roi, skin_mask, max_contour = segmented
+        if skin_mask is None:
+            # Still calibrating
+            return frame
+        
+        frame_height, frame_width = frame.shape[:2]
+        
+        finger_count = 0
+        
+        if max_contour is not None:
+            contour_area = cv2.contourArea(max_contour)
+            
+            # Show contour area for debugging
+            self.area_text.draw(frame, f"Contour Area: {contour_area:.0f}",
+                                (self.roi_left, self.roi_top - 70))
+            
+            # Filter small contours (lowered threshold)
+            if contour_area > MIN_HAND_AREA:
+                # Draw straight onto the ROI view; a blended canvas would
+                # cost a full ROI allocation and blend for a few lines
+                cv2.drawContours(roi, [max_contour], -1, (0, 255, 0), 2)
+                
+                # Mask gate: compare a 32x32 thumbnail with the one from the last
+                # count, and reuse that count while the hand holds still
+                small = cv2.resize(skin_mask, (32, 32), interpolation=cv2.INTER_AREA)
+                if (self.last_hand is None
+                        or cv2.absdiff(small, self.counted_small).mean() >= self.mask_threshold):
+                    self.last_hand = self.analyze_contour(max_contour)
+                    self.counted_small = small
+                finger_count, hull, center, gap_points = self.last_hand
+                self.draw_hand_markers(roi, hull, center, gap_points)
+                
+                # Perform action
+                action = self.perform_action(finger_count)
+                if action:
+                    self.last_action = action
+            else:
+                self.last_hand = None
+                self.too_small_text.draw(frame, (self.roi_left, self.roi_top - 40))
+        else:
+            self.last_hand = None
+            self.no_skin_text.draw(frame, (self.roi_left, self.roi_top - 40))
+        
+        # Draw info panel
+        self.draw_info_panel(frame, finger_count, self.last_action)
+        
+        # Display instructions
+        self.instructions_text.draw(frame, (10, frame_height - 10))
+        
+        windows = {'Finger Detector (OpenCV)': frame}
+        if self.debug:
+            # Show the skin mask in a small window for debugging
+            windows['Skin Detection (Debug)'] = skin_mask
+        return windows
     
     def run(self):
         """Main loop to run finger detection"""
-        cap = cv2.VideoCapture(0)
+        cap = open_camera(0, CAPTURE_WIDTH, CAPTURE_HEIGHT)
         
         if not cap.isOpened():
             print("Error: Could not open camera")
@@ -238,116 +552,22 @@ class FingerDetectorOpenCV:
         print("-" * 50)
         print("\nTIP: Spread your fingers wide for best detection!")
         
-        last_action = None
+        # Each stage is already a thread of its own, so OpenCV's internal
+        # thread pool would only oversubscribe the cores (process-wide setting)
+        cv2.setNumThreads(1)
         
-        # Calibration frames
-        calibration_frames = 30
-        frame_count = 0
+        # A resizable window lets HighGUI show the frame scaled down
+        cv2.namedWindow('Finger Detector (OpenCV)', cv2.WINDOW_NORMAL)
+        cv2.resizeWindow('Finger Detector (OpenCV)', DISPLAY_WIDTH, DISPLAY_HEIGHT)
         
-        while cap.isOpened():
-            success, frame = cap.read()
-            if not success:
-                print("Failed to grab frame")
-                continue
-            
-            # Flip frame horizontally for mirror view
-            frame = cv2.flip(frame, 1)
-            frame_height, frame_width = frame.shape[:2]
-            
-            # Draw ROI rectangle
-            cv2.rectangle(frame, (self.roi_left, self.roi_top), 
-                         (self.roi_right, self.roi_bottom), (0, 255, 0), 2)
-            
-            # Extract ROI
-            roi = frame[self.roi_top:self.roi_bottom, self.roi_left:self.roi_right]
-            
-            # Calibration phase
-            if frame_count < calibration_frames:
-                cv2.putText(frame, f"Calibrating... {calibration_frames - frame_count}", 
-                           (self.roi_left, self.roi_top - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                cv2.putText(frame, "Keep hand OUT of green box", 
-                           (self.roi_left, self.roi_top - 40),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
-                
-                # Feed background subtractor
-                _ = self.bg_subtractor.apply(roi, learningRate=0.5)
-                frame_count += 1
-                
-                cv2.imshow('Finger Detector (OpenCV)', frame)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-                continue
-            
-            # Detect skin in ROI
-            skin_mask = self.detect_skin(roi)
-            
-            # Show skin mask in a small window for debugging
-            cv2.imshow('Skin Detection (Debug)', skin_mask)
-            
-            # Find contours
-            contours, _ = cv2.findContours(skin_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            finger_count = 0
-            
-            if contours:
-                # Get the largest contour (assumed to be the hand)
-                max_contour = max(contours, key=cv2.contourArea)
-                contour_area = cv2.contourArea(max_contour)
-                
-                # Show contour area for debugging
-                cv2.putText(frame, f"Contour Area: {contour_area:.0f}", 
-                           (self.roi_left, self.roi_top - 70),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                
-                # Filter small contours (lowered threshold)
-                if contour_area > 3000:
-                    # Create a drawing canvas
-                    drawing = np.zeros_like(roi)
-                    
-                    # Draw contour
-                    cv2.drawContours(drawing, [max_contour], -1, (0, 255, 0), 2)
-                    
-                    # Count fingers
-                    finger_count, drawing = self.count_fingers_contour(max_contour, drawing)
-                    
-                    # Display the drawing in the ROI area
-                    roi_with_drawing = cv2.addWeighted(roi, 0.7, drawing, 0.3, 0)
-                    frame[self.roi_top:self.roi_bottom, self.roi_left:self.roi_right] = roi_with_drawing
-                    
-                    # Perform action
-                    action = self.perform_action(finger_count)
-                    if action:
-                        last_action = action
-                else:
-                    cv2.putText(frame, "Area too small - move hand closer", 
-                               (self.roi_left, self.roi_top - 40),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 165, 255), 2)
-            else:
-                cv2.putText(frame, "No skin detected - check lighting", 
-                           (self.roi_left, self.roi_top - 40),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
-            
-            # Draw info panel
-            self.draw_info_panel(frame, finger_count, last_action)
-            
-            # Display instructions
-            cv2.putText(frame, "Press 'q' to quit | Place hand in green box", 
-                       (10, frame_height - 10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-            
-            # Show the frame
-            cv2.imshow('Finger Detector (OpenCV)', frame)
-            
-            # Exit on 'q' press
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+        # Capture, segmentation, counting and display each run on their own
+        # thread, so up to four consecutive frames are processed at once
+        run_pipeline(cap, [self.segment_hand, self.annotate_hand], 'Finger Detector (OpenCV)')
         
         cap.release()
         cv2.destroyAllWindows()
         print("\nFinger Detector stopped.")
 
 if __name__ == "__main__":
-    detector = FingerDetectorOpenCV()
+    detector = FingerDetectorOpenCV(debug="--debug" in sys.argv[1:])
     detector.run()
-
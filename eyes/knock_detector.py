@@ -1,3 +1,4 @@
+import math
 import numpy as np
 import sounddevice as sd
 import time
@@ -6,6 +7,60 @@ import threading
 import cv2
 import webbrowser
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _rms_and_spike(samples, previous):
+    """RMS volume of a flat sample block, and its rise over the previous volume"""
+    volume = math.sqrt(float(np.dot(samples, samples)) / samples.size)
+    return volume, volume - previous
+
+
+def _rms_and_spike_loop(samples, previous):
+    """Same as _rms_and_spike in one scalar pass; compiled with numba"""
+    total = 0.0
+    for x in samples:
+        total += x * x
+    volume = math.sqrt(total / samples.size)
+    return volume, volume - previous
+
+
+def _best_match(intervals, expected, lengths, tolerances):
+    """
+    Index of the pattern (row of the zero-padded expected matrix) whose
+    intervals all lie within its tolerance with the smallest mean difference,
+    or -1. Compiled with numba when available.
+    """
+    n = intervals.shape[0]
+    best = -1
+    best_score = np.inf
+    for p in range(expected.shape[0]):
+        if lengths[p] != n:
+            continue
+        total = 0.0
+        ok = True
+        for i in range(n):
+            diff = abs(intervals[i] - expected[p, i])
+            if diff > tolerances[p]:
+                ok = False
+                break
+            total += diff
+        if ok and total / n < best_score:
+            best_score = total / n
+            best = p
+    return best
+
+
+if NUMBA_AVAILABLE:
+    # Keeps interpreter dispatch out of the realtime audio callback
+    _rms_and_spike = numba.njit(cache=True, fastmath=True)(_rms_and_spike_loop)
+    _best_match = numba.njit(cache=True)(_best_match)
+
+
 class KnockDetector:
     def __init__(self):
         # Audio settings
@@ -57,6 +112,21 @@ class KnockDetector:
             }
         }
         
+        # Patterns as arrays for _best_match, rows padded to the longest
+        self.pattern_names = list(self.patterns)
+        longest = max(len(p['pattern']) for p in self.patterns.values())
+        self.pattern_matrix = np.zeros((len(self.patterns), longest))
+        for row, pattern_data in zip(self.pattern_matrix, self.patterns.values()):
+            row[:len(pattern_data['pattern'])] = pattern_data['pattern']
+        self.pattern_lengths = np.array([len(p['pattern']) for p in self.patterns.values()])
+        self.pattern_tolerances = np.array([p['tolerance'] for p in self.patterns.values()])
+        
+        if NUMBA_AVAILABLE:
+            # Compile now rather than in the audio callback
+            _rms_and_spike(np.zeros(self.chunk_size * self.channels, np.float32), 0.0)
+            _best_match(np.zeros(2), self.pattern_matrix, self.pattern_lengths,
+                        self.pattern_tolerances)
+        
         # Recording mode
         self.recording_mode = False
         self.recorded_pattern = []
@@ -64,12 +134,14 @@ class KnockDetector:
         # Running flag
         self.running = False
         
-        # Audio buffer for visualization
-        self.audio_buffer = deque(maxlen=200)
+        # Recent volumes for visualization: a ring buffer written by the audio
+        # callback; wave_count is the total number of volumes written
+        self.wave = np.zeros(200, np.float32)
+        self.wave_count = 0
         self.peak_buffer = deque(maxlen=50)
         
         # For detecting sudden volume changes (knocks are sharp/transient)
-        self.previous_volume = 0
+        self.previous_volume = 0.0
         self.spike_threshold = 0.01  # Minimum volume increase to count as knock (calibrated for your mic)
         
         # Visual window
@@ -91,31 +163,9 @@ class KnockDetector:
     
     def match_pattern(self, intervals):
         """Check if intervals match any known pattern"""
-        best_match = None
-        best_score = float('inf')
-        
-        for pattern_name, pattern_data in self.patterns.items():
-            expected = pattern_data['pattern']
-            tolerance = pattern_data['tolerance']
-            
-            # Check if number of intervals match
-            if len(intervals) != len(expected):
-                continue
-            
-            # Calculate how well the pattern matches
-            differences = []
-            for i in range(len(intervals)):
-                diff = abs(intervals[i] - expected[i])
-                differences.append(diff)
-            
-            # Check if all differences are within tolerance
-            if all(d <= tolerance for d in differences):
-                avg_diff = sum(differences) / len(differences)
-                if avg_diff < best_score:
-                    best_score = avg_diff
-                    best_match = pattern_name
-        
-        return best_match
+        best = _best_match(np.asarray(intervals, np.float64), self.pattern_matrix,
+                           self.pattern_lengths, self.pattern_tolerances)
+        return self.pattern_names[best] if best >= 0 else None
     
     def perform_action(self, pattern_name):
         """Perform action based on matched pattern"""
@@ -159,7 +209,8 @@ class KnockDetector:
                    cv2.FONT_HERSHEY_DUPLEX, 1.2, (255, 255, 255), 2)
         
         # Draw audio waveform
-        if len(self.audio_buffer) > 0:
+        wave_count = self.wave_count
+        if wave_count > 0:
             wave_y_start = 100
             wave_height = 150
             wave_center = wave_y_start + wave_height // 2
@@ -177,23 +228,25 @@ class KnockDetector:
                        (self.window_width - 180, threshold_y - 5),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
             
-            # Draw waveform
-            buffer_list = list(self.audio_buffer)
-            points = []
-            for i, volume in enumerate(buffer_list):
-                x = int(20 + (i / len(buffer_list)) * (self.window_width - 40))
-                y = int(wave_center - (volume * wave_height / 2))
-                y = max(wave_y_start, min(wave_y_start + wave_height, y))
-                points.append((x, y))
+            # Draw waveform: the ring buffer oldest first, at most its length
+            n = min(wave_count, len(self.wave))
+            start = wave_count % len(self.wave)
+            volumes = np.concatenate((self.wave[start:], self.wave[:start]))[-n:]
+            xs = 20 + np.arange(n) / n * (self.window_width - 40)
+            ys = np.clip(wave_center - volumes * wave_height / 2,
+                         wave_y_start, wave_y_start + wave_height)
+            points = np.stack([xs, ys], axis=1).astype(np.int32)
             
-            # Draw the waveform line
-            if len(points) > 1:
-                for i in range(len(points) - 1):
-                    color = (0, 255, 0) if buffer_list[i] < self.threshold else (0, 255, 255)
-                    cv2.line(canvas, points[i], points[i + 1], color, 2)
+            # Draw the waveform line: one polylines call per color instead of
+            # one line per segment
+            if n > 1:
+                segments = np.stack([points[:-1], points[1:]], axis=1)
+                quiet = volumes[:-1] < self.threshold
+                cv2.polylines(canvas, list(segments[quiet]), False, (0, 255, 0), 2)
+                cv2.polylines(canvas, list(segments[~quiet]), False, (0, 255, 255), 2)
             
             # Current volume indicator
-            current_vol = buffer_list[-1] if buffer_list else 0
+            current_vol = float(volumes[-1])
             cv2.putText(canvas, f"Volume: {current_vol:.3f}", 
                        (30, wave_y_start - 10),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
@@ -295,14 +348,14 @@ class KnockDetector:
         if status:
             print(f"Audio Status: {status}")
         
-        # Calculate volume (RMS)
-        volume = np.sqrt(np.mean(indata**2))
-        self.audio_buffer.append(volume)
+        # Calculate volume (RMS) and detect knock (sudden spike in volume -
+        # characteristic of impacts)
+        volume, volume_spike = _rms_and_spike(indata.reshape(-1), self.previous_volume)
+        self.wave[self.wave_count % len(self.wave)] = volume
+        self.wave_count += 1
         
         current_time = time.time()
         
-        # Detect knock (sudden spike in volume - characteristic of impacts)
-        volume_spike = volume - self.previous_volume
         self.previous_volume = volume
         self.current_spike = volume_spike  # Store for display
         
@@ -400,6 +453,7 @@ class KnockDetector:
                     channels=self.channels,
                     samplerate=self.sample_rate,
                     blocksize=self.chunk_size,
+                    dtype='float32',  # np.dot on float32 runs as BLAS sdot
                     callback=self.audio_callback
                 ):
                     while self.running:
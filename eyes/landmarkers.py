@@ -0,0 +1,95 @@
+# landmarkers.py
+# MediaPipe Tasks landmarkers shared by the trackers. Unlike the legacy
+# mp.solutions graphs, Tasks can run inference on the GPU delegate, and in
+# LIVE_STREAM mode frames are submitted asynchronously with results delivered
+# to a callback, so MediaPipe overlaps ingestion with the previous inference.
+
+import time
+
+import mediapipe as mp
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+from mediapipe.tasks.python import BaseOptions
+from mediapipe.tasks.python import vision
+
+from model_files import fetch_model
+
+MODEL_URL = "https://storage.googleapis.com/mediapipe-models/{name}/{name}/float16/1/{name}.task"
+
+
+def create_landmarker(landmarker_cls, options_cls, name, result_callback, **options):
+    """
+    Create a LIVE_STREAM landmarker on the GPU delegate, falling back to CPU
+    where unsupported. result_callback(result, image, timestamp_ms) runs on a
+    MediaPipe thread.
+    """
+    path = fetch_model(f"{name}.task", MODEL_URL.format(name=name))
+    try:
+        return landmarker_cls.create_from_options(options_cls(
+            base_options=BaseOptions(model_asset_path=path, delegate=BaseOptions.Delegate.GPU),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            result_callback=result_callback,
+            **options
+        ))
+    except (RuntimeError, NotImplementedError):
+        # No GPU delegate on this platform/build (e.g. Windows)
+        print("GPU delegate unavailable, running MediaPipe on CPU")
+    return landmarker_cls.create_from_options(options_cls(
+        base_options=BaseOptions(model_asset_path=path, delegate=BaseOptions.Delegate.CPU),
+        running_mode=vision.RunningMode.LIVE_STREAM,
+        result_callback=result_callback,
+        **options
+    ))
+
+
+def create_face_landmarker(result_callback, **options):
+    return create_landmarker(
+        vision.FaceLandmarker, vision.FaceLandmarkerOptions, "face_landmarker",
+        result_callback, **options
+    )
+
+
+def create_hand_landmarker(result_callback, **options):
+    return create_landmarker(
+        vision.HandLandmarker, vision.HandLandmarkerOptions, "hand_landmarker",
+        result_callback, **options
+    )
+
+
+class StreamClock:
+    """Strictly increasing millisecond timestamps, as LIVE_STREAM mode requires"""
+    def __init__(self):
+        self.last = -1
+
+    def __call__(self):
+        self.last = max(int(time.monotonic() * 1000), self.last + 1)
+        return self.last
+
+
+def to_image(rgb):
+    """MediaPipe image of an RGB uint8 array; the pixels are copied, not referenced"""
+    return mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+
+
+def landmarks_to_array(landmarks, width, height, indices=None):
+    """
+    Landmark pixel coordinates as one (N, 2) float32 array, optionally only
+    for the given indices. Built once per frame so downstream code indexes a
+    flat array instead of fetching .x/.y from landmark objects.
+    """
+    if indices is not None:
+        landmarks = [landmarks[idx] for idx in indices]
+    points = np.fromiter(
+        (v for lm in landmarks for v in (lm.x, lm.y)), np.float32, 2 * len(landmarks)
+    ).reshape(-1, 2)
+    points *= (width, height)
+    return points
+
+
+def to_landmark_list(landmarks):
+    """Tasks landmarks as the proto that mp.solutions.drawing_utils draws"""
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    landmark_list.landmark.extend(
+        landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in landmarks
+    )
+    return landmark_list
@@ -0,0 +1,19 @@
+# model_files.py
+# Model weights are not checked in; they are fetched into models/ on first use.
+
+import urllib.request
+from pathlib import Path
+
+MODEL_DIR = Path(__file__).resolve().parent / "models"
+
+
+def fetch_model(filename, url):
+    """Local path of a model file, downloading it from url if it is missing"""
+    path = MODEL_DIR / filename
+    if not path.exists():
+        print(f"Downloading {filename}...")
+        MODEL_DIR.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(".part")
+        urllib.request.urlretrieve(url, tmp_path)
+        tmp_path.replace(path)
+    return str(path)
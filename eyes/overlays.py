@@ -0,0 +1,124 @@
+# overlays.py
+# Static overlay elements rendered once and copied onto each frame, instead of
+# re-issuing the same OpenCV draw calls every frame.
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# Gaze labels indexed [vertical][horizontal]; 0 = up/left, 1 = center, 2 = down/right
+GAZE_DIRECTIONS = (
+    ("Up Left", "Up", "Up Right"),
+    ("Left", "Center", "Right"),
+    ("Down Left", "Down", "Down Right"),
+)
+
+
+def gaze_direction_text(relative_x, relative_y, threshold):
+    """Direction label for a normalized gaze offset: bucket each axis, then one table lookup"""
+    col = 0 if relative_x < -threshold else 2 if relative_x > threshold else 1
+    row = 0 if relative_y < -threshold else 2 if relative_y > threshold else 1
+    return GAZE_DIRECTIONS[row][col]
+
+
+class TextStamp:
+    """Fixed text rendered once to a mask, then stamped onto frames"""
+    def __init__(self, text, scale, color, thickness=1, font=FONT):
+        (text_w, text_h), baseline = cv2.getTextSize(text, font, scale, thickness)
+        # getTextSize under-reports descenders and tall glyphs such as "|", so
+        # render with a generous margin and crop to the pixels actually drawn
+        margin = text_h + thickness
+        mask = np.zeros((text_h + baseline + 2 * margin, text_w + 2 * margin), np.uint8)
+        cv2.putText(mask, text, (margin, margin + text_h), font, scale, 255, thickness)
+        x, y, w, h = cv2.boundingRect(mask)
+        self.mask = np.ascontiguousarray(mask[y:y + h, x:x + w])
+        # Offset of the cropped mask from the putText origin
+        self.dx = x - margin
+        self.dy = y - margin - text_h
+        self.sprite = np.empty((h, w, 3), np.uint8)
+        self.sprite[:] = color
+
+    def draw(self, frame, org):
+        """Stamp the text at the same origin cv2.putText would use (hard-edged, no anti-aliasing)"""
+        x = org[0] + self.dx
+        y = org[1] + self.dy
+        mask_h, mask_w = self.mask.shape
+
+        # Clip to the frame
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + mask_w, frame.shape[1]), min(y + mask_h, frame.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        sx, sy = x0 - x, y0 - y
+        cv2.copyTo(self.sprite[sy:sy + y1 - y0, sx:sx + x1 - x0],
+                   self.mask[sy:sy + y1 - y0, sx:sx + x1 - x0],
+                   frame[y0:y1, x0:x1])
+
+
+class Text:
+    """One text style drawn with plain cv2.putText, for strings that change every frame"""
+    def __init__(self, scale, color, thickness=1, font=FONT):
+        self.scale = scale
+        self.color = color
+        self.thickness = thickness
+        self.font = font
+
+    def draw(self, frame, text, org):
+        cv2.putText(frame, text, org, self.font, self.scale, self.color, self.thickness)
+
+
+class CachedText:
+    """One text style; each distinct string is rendered once and then stamped.
+    Only worth it for strings that repeat, e.g. labels picked from a small set"""
+    def __init__(self, scale, color, thickness=1, font=FONT, max_strings=256):
+        self.scale = scale
+        self.color = color
+        self.thickness = thickness
+        self.font = font
+        self.max_strings = max_strings
+        self.stamps = {}
+
+    def draw(self, frame, text, org):
+        stamp = self.stamps.get(text)
+        if stamp is None:
+            # Changing strings (e.g. coordinates) would grow this without bound
+            if len(self.stamps) >= self.max_strings:
+                self.stamps.clear()
+            stamp = TextStamp(text, self.scale, self.color, self.thickness, self.font)
+            self.stamps[text] = stamp
+        stamp.draw(frame, org)
+
+
+class GazeIndicator:
+    """Gaze direction box in the top right corner; only the gaze dot is redrawn per frame"""
+    def __init__(self, size=150, margin=20):
+        self.size = size
+        self.margin = margin
+        center = size // 2
+
+        # Background, center point and cross-hairs never move
+        self.sprite = np.empty((size + 1, size + 1, 3), np.uint8)
+        self.sprite[:] = (50, 50, 50)
+        cv2.circle(self.sprite, (center, center), 3, (200, 200, 200), -1)
+        cv2.line(self.sprite, (center, 0), (center, size), (100, 100, 100), 1)
+        cv2.line(self.sprite, (0, center), (size, center), (100, 100, 100), 1)
+
+        self.label = TextStamp("Gaze Direction", 0.5, (255, 255, 255))
+
+    def draw(self, frame, relative_x, relative_y):
+        indicator_x = frame.shape[1] - self.size - self.margin
+        indicator_y = self.margin
+
+        # Static parts
+        frame[indicator_y:indicator_y + self.size + 1,
+              indicator_x:indicator_x + self.size + 1] = self.sprite
+        self.label.draw(frame, (indicator_x, indicator_y - 5))
+
+        # Draw gaze point
+        center_x = indicator_x + self.size // 2
+        center_y = indicator_y + self.size // 2
+        gaze_x = int(center_x + relative_x * (self.size // 2 - 10))
+        gaze_y = int(center_y + relative_y * (self.size // 2 - 10))
+        cv2.circle(frame, (gaze_x, gaze_y), 8, (0, 255, 255), -1)
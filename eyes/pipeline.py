@@ -0,0 +1,192 @@
+# pipeline.py
+# Threaded capture -> inference -> display pipeline shared by the trackers.
+# Camera reads, model inference and rendering overlap instead of running back
+# to back, so throughput approaches the FPS of the slowest stage.
+
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+# Frames waiting between two stages; kept small so the display stays live
+QUEUE_SIZE = 2
+
+# Requested camera mode; fixing it up front stops the driver renegotiating.
+# The landmark models resize to ~200 px internally, so 480p loses nothing
+CAPTURE_WIDTH = 640
+CAPTURE_HEIGHT = 480
+CAPTURE_FPS = 30
+
+
+def open_camera(index=0, width=CAPTURE_WIDTH, height=CAPTURE_HEIGHT):
+    """Open a webcam configured for low latency: MJPG, one-frame driver buffer"""
+    cap = cv2.VideoCapture(index)
+    # MJPG is far cheaper to transfer and decode than the default YUYV
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, CAPTURE_FPS)
+    # The default multi-frame buffer hands out stale frames (~100 ms behind)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+def frame_slots(num_stages):
+    """Capture buffers needed so no stage ever waits on the pool"""
+    # Every queue full, plus one frame each in capture, the stages and display
+    return (num_stages + 1) * QUEUE_SIZE + num_stages + 2
+
+
+class FramePool:
+    """Fixed set of preallocated frame buffers recycled between the stages"""
+    def __init__(self, like, count):
+        self.free = queue.Queue()
+        for _ in range(count):
+            self.free.put(np.empty_like(like))
+
+    def acquire(self):
+        return self.free.get()
+
+    def release(self, frame):
+        self.free.put(frame)
+
+
+def put_latest(q, item, pool):
+    """Queue item without blocking, dropping the oldest entry if the consumer is behind"""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                old = q.get_nowait()
+            except queue.Empty:
+                continue
+            if old is not None:
+                # Display items are (frame, annotated); capture items are bare frames
+                pool.release(old[0] if isinstance(old, tuple) else old)
+
+
+class CaptureThread(threading.Thread):
+    """Grabs every camera frame but only decodes the ones the processor can take"""
+    def __init__(self, cap, pool, out_q, stop_event, busy):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.pool = pool
+        self.out_q = out_q
+        self.stop_event = stop_event
+        self.busy = busy
+
+    def run(self):
+        try:
+            while self.cap.isOpened() and not self.stop_event.is_set():
+                # grab() keeps up with the camera; decoding waits for retrieve()
+                if not self.cap.grab():
+                    print("Failed to grab frame")
+                    continue
+
+                # Processor behind: drop this frame without paying for the decode
+                if self.busy.is_set() or self.out_q.full():
+                    continue
+
+                # retrieve() decodes straight into the buffer when the size matches
+                buf = self.pool.acquire()
+                success, frame = self.cap.retrieve(buf)
+                if not success:
+                    self.pool.release(buf)
+                    print("Failed to grab frame")
+                    continue
+                put_latest(self.out_q, frame, self.pool)
+        finally:
+            put_latest(self.out_q, None, self.pool)
+
+
+class StageThread(threading.Thread):
+    """
+    Runs one processing stage and queues (frame, result) for the next. The
+    first stage gets the captured frame, later ones the previous stage's
+    result; the pool frame travels along until display releases it.
+    """
+    def __init__(self, stage, in_q, out_q, pool, busy=None):
+        super().__init__(daemon=True)
+        self.stage = stage
+        self.in_q = in_q
+        self.out_q = out_q
+        self.pool = pool
+        self.busy = busy
+
+    def run(self):
+        try:
+            while True:
+                item = self.in_q.get()
+                if item is None:
+                    break
+                frame, value = item if isinstance(item, tuple) else (item, item)
+                # Only the first stage gates capture decoding
+                if self.busy is not None:
+                    self.busy.set()
+                try:
+                    result = self.stage(value)
+                finally:
+                    if self.busy is not None:
+                        self.busy.clear()
+                put_latest(self.out_q, (frame, result), self.pool)
+        finally:
+            put_latest(self.out_q, None, self.pool)
+
+
+def run_pipeline(cap, process_frame, window_name):
+    """
+    Show process_frame(frame) for each camera frame until 'q' is pressed.
+    process_frame returns the annotated frame, or a dict of window name -> image.
+    It may also be a list of stages, each fed the previous one's result and
+    run on its own thread, so consecutive frames are in different stages.
+    Capture and inference run on worker threads; imshow/waitKey stay on the
+    calling (main) thread, since HighGUI windows are not thread safe.
+    """
+    stages = list(process_frame) if isinstance(process_frame, (list, tuple)) else [process_frame]
+
+    success, first = cap.read()
+    if not success:
+        print("Failed to grab frame")
+        return
+
+    pool = FramePool(first, frame_slots(len(stages)))
+    # One queue in front of each stage, plus the display queue
+    queues = [queue.Queue(maxsize=QUEUE_SIZE) for _ in range(len(stages) + 1)]
+    display_q = queues[-1]
+    stop = threading.Event()
+    busy = threading.Event()
+
+    workers = [CaptureThread(cap, pool, queues[0], stop, busy)]
+    for i, stage in enumerate(stages):
+        workers.append(StageThread(
+            stage, queues[i], queues[i + 1], pool, busy if i == 0 else None
+        ))
+    for worker in workers:
+        worker.start()
+
+    while True:
+        try:
+            item = display_q.get(timeout=0.05)
+        except queue.Empty:
+            item = ()  # Nothing new yet; keep the window responsive
+        if item is None:
+            break
+        if item:
+            frame, annotated = item
+            # process_frame may return {window name: image} to show several windows
+            if not isinstance(annotated, dict):
+                annotated = {window_name: annotated}
+            for name, image in annotated.items():
+                cv2.imshow(name, image)
+            pool.release(frame)
+
+        # Exit on 'q' press; the sentinel then drains through every stage
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            stop.set()
+
+    stop.set()
+    for worker in workers:
+        worker.join(timeout=1.0)